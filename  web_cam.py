@@ -1,14 +1,27 @@
+import argparse
 import cv2
-import google.generativeai as genai
 import os
+import time
 from dotenv import load_dotenv
-from PIL import Image
-import numpy as np
+
+from capture_pipeline import FrameGrabber, FrameRing, InferenceWorker, StabilityTrigger
+from gemini_client import get_client, image_part, text_part
+from image_prep import prepare_frame
+from tiered_detection import detect_tiered
 
 # ================================
 #  STEP 1: Gemini Object Detection
 # ================================
 
+parser = argparse.ArgumentParser(description="Webcam object detection with Gemini.")
+parser.add_argument("--auto", action="store_true",
+                    help="Detect automatically once a held-up object stays still")
+parser.add_argument("--stable-frames", type=int, default=15,
+                    help="Still frames required before an automatic detection")
+args = parser.parse_args()
+
+STALL_SECONDS = 1.0  # No new frame for this long: the camera is stalled, not just slow
+
 # Load environment variables
 load_dotenv()
 
@@ -17,25 +30,94 @@ api_key = os.getenv("GOOGLE_API_KEY")
 if not api_key:
     raise ValueError("❌ GOOGLE_API_KEY not found in .env file")
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel("models/gemini-2.5-flash")
+client = get_client(api_key)
+
+# Detection prompt
+prompt = (
+    "Identify only the main object being shown by the person in the image. "
+    "Ignore human body parts (like hand, face, eyes, T-shirt, etc.) and background items. "
+    "Describe only the primary object that seems to be intentionally displayed or held up."
+    "Do NOT mention colors, background, people, hands, clothes, or any body parts. "
+    "Return only the object names like 'Apple', 'Book', 'Eyeglasses', etc., as bullet points."
+)
+
+
+def ask_gemini(frame):
+    text = client.generate_text([text_part(prompt), image_part(prepare_frame(frame).jpeg)], deadline=20)
+    return text.strip() if text else None
+
+
+def detect(frame):
+    """Runs on the inference worker thread, never on the display loop."""
+    result = detect_tiered(frame, lambda: ask_gemini(frame))
+    print(f"⚡ Answered by {result.tier} in {result.elapsed_ms:.0f} ms")
+    return result.label
+
 
 # Initialize webcam
 cap = cv2.VideoCapture(0)
 if not cap.isOpened():
     raise Exception("❌ Could not open webcam")
 
+ring = FrameRing()
+grabber = FrameGrabber(cap, ring)
+worker = InferenceWorker(detect)
+trigger = StabilityTrigger(stable_frames=args.stable_frames) if args.auto else None
+grabber.start()
+worker.start()
+
 print("✅ Webcam started successfully.")
-print("👉 Press SPACE to detect objects, or Q to quit.\n")
+if trigger:
+    print(f"👉 Hold an object still for {args.stable_frames} frames to detect it, or press SPACE. Q quits.\n")
+else:
+    print("👉 Press SPACE to detect objects, or Q to quit.\n")
 
+seq = 0
+reported = 0
+stalled = False
+last_fresh = time.monotonic()
 while True:
-    ret, frame = cap.read()
-    if not ret:
+    # The grabber can die while older frames are still in the ring
+    if grabber.failed or not grabber.is_alive():
         print("⚠️ Failed to grab frame.")
         break
 
-    # Show live video feed
-    cv2.imshow("Gemini Object Detection (Press SPACE to Detect)", frame)
+    # Wait briefly for a new frame; the window still refreshes if the camera stalls
+    new_seq, frame = ring.wait_newer(seq, timeout=0.1)
+    if frame is None:
+        continue
+    fresh = new_seq != seq
+    seq = new_seq
+    if fresh:
+        last_fresh = time.monotonic()
+    if stalled != (time.monotonic() - last_fresh > STALL_SECONDS):
+        stalled = not stalled
+        print("⚠️ Camera stalled, waiting for new frames..." if stalled else "✅ Camera feed resumed.")
+
+    fire = False
+    if trigger and fresh and trigger.update(frame):
+        print("\n🎯 Object held still, detecting...")
+        fire = True
+
+    # Show live video feed with the latest result
+    busy, result, error, completed = worker.status()
+    preview = frame.copy()
+    label = "Detecting..." if busy else (result.splitlines()[0] if result else "")
+    if stalled:
+        label = "Camera stalled"
+    if label:
+        cv2.putText(preview, label, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+    cv2.imshow("Gemini Object Detection (Press SPACE to Detect)", preview)
+
+    # Print each finished detection once
+    if completed != reported:
+        reported = completed
+        if error:
+            print("⚠️ Error calling Gemini API:", error)
+        elif result:
+            print("🧠 Detected objects:\n", result)
+        else:
+            print("⚠️ No objects detected or empty response.")
 
     # Wait for key press
     key = cv2.waitKey(1) & 0xFF
@@ -43,37 +125,21 @@ while True:
     # When SPACE is pressed → Capture and detect objects
     if key == ord(' '):
         print("\n📸 Capturing frame and sending to Gemini...")
-        try:
-            # Convert OpenCV frame (BGR) → RGB → PIL Image
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(rgb)
-
-            # Detection prompt
-            prompt = (
-                "Identify only the main object being shown by the person in the image. "
-                "Ignore human body parts (like hand, face, eyes, T-shirt, etc.) and background items. "
-                "Describe only the primary object that seems to be intentionally displayed or held up."
-                "Do NOT mention colors, background, people, hands, clothes, or any body parts. "
-                "Return only the object names like 'Apple', 'Book', 'Eyeglasses', etc., as bullet points."
-            )
-
-            # Send image + prompt to Gemini Vision model
-            response = model.generate_content([prompt, img])
-
-            # Display results
-            if response and response.text:
-                detected = response.text.strip()
-                print("🧠 Detected objects:\n", detected)
-            else:
-                print("⚠️ No objects detected or empty response.")
-        except Exception as e:
-            print("⚠️ Error calling Gemini API:", e)
+        fire = True
 
     # Press Q to quit
     elif key == ord('q'):
         print("👋 Exiting program...")
         break
 
+    if fire and stalled:
+        print("⏳ Camera stalled, no new frame to detect.")
+    elif fire and not worker.submit(frame.copy()):
+        print("⏳ Still waiting on the previous detection, skipped.")
+
 # Release webcam and close windows
+grabber.stop()
+worker.stop()
+grabber.join(timeout=1)
 cap.release()
 cv2.destroyAllWindows()
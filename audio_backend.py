@@ -0,0 +1,88 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+# ========================================
+# 🔊 IN-MEMORY AUDIO BACKEND
+# ========================================
+# Command-line players that can decode audio straight from stdin, with the formats they handle
+PIPE_PLAYERS = [
+    (["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "-"], ("audio/mpeg", "audio/wav")),
+    (["mpg123", "-q", "-"], ("audio/mpeg",)),
+    (["mpv", "--no-video", "--really-quiet", "-"], ("audio/mpeg", "audio/wav")),
+]
+
+
+def audio_mime(data):
+    """Sniff the container of a clip (gTTS gives mp3, local engines give wav)."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav"
+    return "audio/mpeg"
+
+
+class PipePlayer:
+    def __init__(self, command):
+        """
+        Streams clip bytes into a player process over stdin.
+        :param command: argv of a player that reads audio from '-'
+        """
+        self.command = command
+
+    def play(self, data):
+        proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            proc.stdin.write(data)
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
+
+
+class PlaysoundPlayer:
+    """Fallback when no streaming player is installed; playsound needs a path."""
+
+    def play(self, data):
+        suffix = ".wav" if audio_mime(data) == "audio/wav" else ".mp3"
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            from playsound import playsound
+            playsound(path)
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def find_player(mime="audio/mpeg"):
+    """Pick the first streaming player on PATH that decodes this format, else playsound."""
+    for command, formats in PIPE_PLAYERS:
+        if mime in formats and shutil.which(command[0]):
+            return PipePlayer(command)
+    return PlaysoundPlayer()
+
+
+_players = {}  # mime -> player
+_player_lock = threading.Lock()
+
+
+def get_player(mime="audio/mpeg"):
+    with _player_lock:
+        if mime not in _players:
+            _players[mime] = find_player(mime)
+        return _players[mime]
+
+
+def play_bytes(data):
+    """Play an in-memory clip, blocking until it has finished."""
+    if data:
+        get_player(audio_mime(data)).play(data)
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from tts_engines import get_engine
+
+# ========================================
+# 🗂️ CONTENT-ADDRESSED TTS AUDIO CACHE
+# ========================================
+DEFAULT_CACHE_DIR = os.getenv(
+    "DYSLEXIA_TTS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tts_cache"),
+)
+DEFAULT_MEMORY_ITEMS = 512
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+
+def clip_key(text, lang='en', slow=False, engine='gtts'):
+    """Stable content address for one utterance from one engine."""
+    raw = f"{engine}\x00{lang}\x00{int(bool(slow))}\x00{text}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, memory_items=DEFAULT_MEMORY_ITEMS,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        """
+        Two-level cache of synthesized speech clips.
+        :param cache_dir: Directory holding the on-disk clip store
+        :param memory_items: Number of clips kept in the in-memory LRU
+        :param max_disk_bytes: Disk budget; oldest clips are evicted past it
+        """
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".clip")
+
+    def _scan_disk(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".clip"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Drop least recently used clips until the store fits its budget."""
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        for path, size, _ in sorted(self._scan_disk(), key=lambda entry: entry[2]):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                self._disk_bytes -= size
+            except OSError:
+                pass
+
+    def get(self, text, lang='en', slow=False, engine='gtts'):
+        """Return cached clip bytes, or None on a miss."""
+        key = clip_key(text, lang, slow, engine)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._remember(key, data)
+            self.hits += 1
+        return data
+
+    def put(self, text, data, lang='en', slow=False, engine='gtts'):
+        """Store clip bytes in both tiers."""
+        key = clip_key(text, lang, slow, engine)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # Atomic, so readers never see half a clip
+
+        with self._lock:
+            self._remember(key, data)
+            self._disk_bytes += len(data) - replaced
+            self._evict_disk()
+
+    def get_or_render(self, text, lang='en', slow=False, engine=None):
+        """
+        Return (clip bytes, engine name), calling the TTS engine only on a cache miss.
+        The name says which voice the clip is in (e.g. a fallback engine's).
+        """
+        engine = engine or get_engine()
+        for name in engine.names():
+            data = self.get(text, lang, slow, name)
+            if data is not None:
+                return data, name
+
+        data, produced_by = engine.render(text, lang=lang, slow=slow)
+        self.put(text, data, lang, slow, produced_by)
+        return data, produced_by
+
+    def get_or_synthesize(self, text, lang='en', slow=False, engine=None):
+        """Return clip bytes, calling the TTS engine only on a cache miss."""
+        return self.get_or_render(text, lang, slow, engine)[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_tts_cache():
+    """Process-wide cache shared by every speech path."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = TTSCache()
+    return _shared_cache
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import time
+
+from audio_backend import audio_mime, play_bytes
+
+# ========================================
+# 📡 AUDIO DELIVERY: BROWSER OR SERVER SPEAKERS
+# ========================================
+# "browser" (default) sends clip bytes to the student's browser and returns at
+# once; "server" plays on this machine's speakers (single-kiosk setups).
+AUDIO_DELIVERY = os.getenv("DYSLEXIA_AUDIO_DELIVERY", "browser")
+# /speak?word= can return new bytes for the same URL (fallback voice, rebuilt clip bank),
+# so browsers keep the clip but revalidate it by ETag every time (a 304 when unchanged)
+CACHE_CONTROL = "no-cache"
+
+
+def plays_in_browser():
+    return AUDIO_DELIVERY != "server"
+
+
+def deliver_clip(data, wait=False, container=None):
+    """
+    Send a clip to the Streamlit page (autoplaying), or play it here in server mode.
+    :param wait: Also block in browser mode until the clip has played (e.g. a prompt
+                 that must finish before the microphone opens); server mode always blocks
+    :param container: Streamlit container to render the player in (e.g. an st.empty()
+                      slot reused clip after clip); defaults to the page
+    """
+    if not data:
+        return
+    if plays_in_browser():
+        import streamlit as st
+        (container or st).audio(data, format=audio_mime(data), autoplay=True)
+        if wait:
+            from spelled_track import clip_duration_ms
+            time.sleep(clip_duration_ms(data) / 1000)
+    else:
+        play_bytes(data)
+
+
+def clip_etag(data):
+    """Strong ETag for clip bytes."""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def byte_range(header, size):
+    """
+    Parse a single-range "Range: bytes=..." header.
+    :return: (start, end) inclusive, or None to send the whole body
+    :raises ValueError: The range cannot be satisfied (answer 416)
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None  # Absent, foreign unit or multi-range: full body is allowed
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = size - int(last), size - 1  # Suffix range: the last N bytes
+    except ValueError:
+        return None
+    if first and last and end < start:
+        return None  # Invalid (e.g. bytes=9-2): RFC 9110 says ignore it, not 416
+    start, end = max(0, start), min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Range {header!r} not satisfiable for {size} bytes")
+    return start, end
@@ -0,0 +1,49 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# ========================================
+# ⏩ PIPELINED CLIP PLAYBACK
+# ========================================
+DEFAULT_LOOKAHEAD = 3
+
+
+def play_pipelined(items, fetch, play, on_start=None, lookahead=DEFAULT_LOOKAHEAD):
+    """
+    Play a sequence of clips while the next ones are fetched in the background.
+    :param items: Sequence of things to speak (letters, tokens, ...)
+    :param fetch: fetch(item) -> clip, run on a worker thread (may hit the network)
+    :param play: play(item, clip) -> None, blocks until playback is finished
+    :param on_start: on_start(index, item), called on this thread right before
+                     the item's clip starts playing (e.g. to move the highlight)
+    :param lookahead: Maximum number of clips synthesized ahead of playback
+    """
+    items = list(items)
+    if not items:
+        return
+
+    lookahead = max(1, lookahead)
+    with ThreadPoolExecutor(max_workers=lookahead, thread_name_prefix="tts-prefetch") as pool:
+        pending = deque()
+        next_index = 0
+
+        def submit_next():
+            nonlocal next_index
+            if next_index < len(items):
+                pending.append(pool.submit(fetch, items[next_index]))
+                next_index += 1
+
+        for _ in range(lookahead):
+            submit_next()
+
+        for index, item in enumerate(items):
+            future = pending.popleft()
+            try:
+                clip = future.result()
+            except Exception as e:
+                print(f"❌ TTS Error: {e}")
+                clip = None
+            submit_next()  # Keep the look-ahead window full while this one plays
+
+            if on_start is not None:
+                on_start(index, item)
+            play(item, clip)
@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import io
+import multiprocessing
+import os
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from audio_delivery import CACHE_CONTROL, byte_range, clip_etag
+from letter_lexicon import SPELLING_GRAMMAR
+from scoring import MODES, score_attempt
+from streaming_asr import CHUNK_FRAMES, StreamingRecognizer, vosk_available
+from tiered_detection import detect_image
+from spelled_track import build_spelled_track
+from vad import EnergyVAD, listen_with_vad
+
+# ========================================
+# 🌐 ASYNC BACKEND FOR index.html / script.js
+# ========================================
+# The event loop only parses requests and writes responses. Network-bound work
+# (Gemini, gTTS) runs on a bounded thread pool, CPU-bound scoring on a process
+# pool, and the server's camera/microphone on a single device thread. Audio is
+# returned to the browser, never played here.
+DEFAULT_HOST = os.getenv("DYSLEXIA_API_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("DYSLEXIA_API_PORT", "8000"))
+CORS_ORIGINS = os.getenv("DYSLEXIA_CORS_ORIGINS", "*")
+THREAD_WORKERS = 16
+PROCESS_WORKERS = min(4, os.cpu_count() or 1)
+QUEUE_PER_WORKER = 4  # Requests allowed to wait per worker before answering 503
+MAX_UPLOAD_BYTES = 8 * 1024 * 1024
+ASR_SAMPLE_RATE = 16000
+
+
+# --- Blocking helpers (run in the pools) -------------------------------------
+
+_camera = None
+_camera_lock = threading.Lock()
+
+
+def capture_jpeg(device_index=0):
+    """One JPEG from the server's webcam, for clients that do not upload a photo."""
+    import cv2
+    global _camera
+    with _camera_lock:
+        if _camera is None or not _camera.isOpened():
+            _camera = cv2.VideoCapture(device_index)
+        for _ in range(3):  # Skip frames buffered by the driver
+            _camera.grab()
+        ok, frame = _camera.read()
+        if not ok:
+            raise RuntimeError("Could not read from the server camera")
+    ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return jpeg.tobytes()
+
+
+def transcribe(audio, mode):
+    """Alternative transcripts (uppercase) for an sr.AudioData."""
+    import speech_recognition as sr
+
+    if vosk_available():
+        pcm = audio.get_raw_data(convert_rate=ASR_SAMPLE_RATE, convert_width=2)
+        streamer = StreamingRecognizer(ASR_SAMPLE_RATE, grammar=SPELLING_GRAMMAR if mode == "spelling" else None)
+        step = CHUNK_FRAMES * 2
+        for start in range(0, len(pcm), step):
+            streamer.feed(pcm[start:start + step])
+        text = streamer.finish().upper()
+        return [text] if text else []
+    try:
+        result = sr.Recognizer().recognize_google(audio, language='en-US', show_all=True)
+    except sr.UnknownValueError:
+        return []
+    if not isinstance(result, dict):
+        return []
+    return [alt['transcript'].upper() for alt in result.get('alternative', [])]
+
+
+def transcribe_upload(data, mode):
+    """Transcripts for an uploaded WAV/AIFF/FLAC recording."""
+    import speech_recognition as sr
+    with sr.AudioFile(io.BytesIO(data)) as source:
+        audio = sr.Recognizer().record(source)
+    return transcribe(audio, mode)
+
+
+def transcribe_microphone(mode):
+    """Listen on the server's microphone until the speaker stops."""
+    import speech_recognition as sr
+    recognizer = sr.Recognizer()
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        vad = EnergyVAD.for_mode(mode, source.SAMPLE_RATE, energy_threshold=recognizer.energy_threshold)
+        audio = listen_with_vad(source, vad, timeout=8, max_seconds=15 if mode == "spelling" else 5)
+    return transcribe(audio, mode)
+
+
+def spelled_audio(word, slow_letters, slow_word):
+    """(bytes, mime, etag) of the spelled-then-spoken track; built once per word."""
+    track = build_spelled_track(word, 'en', slow_letters, slow_word)
+    return track.audio, track.mime, clip_etag(track.audio)
+
+
+# --- Request plumbing --------------------------------------------------------
+
+class Saturated(Exception):
+    """Every worker is busy and the wait list is full."""
+
+
+async def offload(request, pool, fn, *args):
+    """Run fn(*args) on one of the app's pools, waiting for a free slot."""
+    app = request.app
+    slots = app["slots"][pool]
+    if slots.locked():
+        raise Saturated(pool)
+    async with slots:
+        return await asyncio.get_running_loop().run_in_executor(app["pools"][pool], fn, *args)
+
+
+def session_of(request):
+    return request.query.get("session") or request.headers.get("X-Session-Id") or request.remote
+
+
+def flag(request, name, default):
+    value = request.query.get(name)
+    return default if value is None else value.lower() in ("1", "true", "yes")
+
+
+def error(message, status):
+    return web.json_response({"error": message}, status=status)
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    if request.method == "OPTIONS":
+        response = web.Response(status=204)
+    else:
+        try:
+            response = await handler(request)
+        except Saturated:
+            response = error("Server is busy, please try again.", 503)
+        except web.HTTPException as e:
+            response = e
+        except Exception as e:
+            # Answer with the CORS headers too, or the browser only reports a CORS failure
+            print(f"⚠️ {request.method} {request.path} failed: {e!r}")
+            traceback.print_exc()
+            response = error("Internal server error", 500)
+    response.headers["Access-Control-Allow-Origin"] = CORS_ORIGINS
+    response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type, X-Session-Id, Range, If-None-Match"
+    return response
+
+
+# --- Endpoints -----------------------------------------------------------------
+
+async def detect(request):
+    """
+    GET  /detect  -> photo from the server camera
+    POST /detect  -> photo in the body (image/jpeg)
+    """
+    if request.method == "POST":
+        image = await request.read()
+        if not image:
+            return error("Empty image upload", 400)
+    else:
+        try:
+            image = await offload(request, "devices", capture_jpeg)
+        except RuntimeError as e:
+            return error(str(e), 503)
+
+    try:
+        result = await offload(request, "threads", detect_image, image, request.app["api_key"], session_of(request))
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(f"Detection failed: {e}", 502)
+    return web.json_response({
+        "object": result.label,
+        "tier": result.tier,
+        "elapsed_ms": round(result.elapsed_ms, 1),
+        "confidence": result.confidence,
+    })
+
+
+async def speak(request):
+    """
+    GET /speak?word=  -> the spelled-then-spoken track as audio/mpeg (or audio/wav).
+    Nothing plays on the server: the browser streams the clip, revalidates it
+    with If-None-Match and seeks with Range requests.
+    """
+    word = request.query.get("word", "").strip()
+    if not word:
+        return error("Missing 'word'", 400)
+    try:
+        data, mime, etag = await offload(request, "threads", spelled_audio, word,
+                                         flag(request, "slow_letters", True), flag(request, "slow_word", False))
+    except Exception as e:
+        return error(f"Speech synthesis failed: {e}", 502)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Access-Control-Expose-Headers": "ETag, Content-Range, Accept-Ranges",
+    }
+    if etag in request.headers.get("If-None-Match", ""):
+        return web.Response(status=304, headers=headers)
+
+    if request.headers.get("If-Range", etag) == etag:
+        try:
+            span = byte_range(request.headers.get("Range"), len(data))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(data)}"
+            return web.Response(status=416, headers=headers)
+    else:
+        span = None  # The client's partial copy is stale: send everything
+    if span is None:
+        return web.Response(body=data, content_type=mime, headers=headers)
+    start, end = span
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+    return web.Response(status=206, body=data[start:end + 1], content_type=mime, headers=headers)
+
+
+async def check_pronunciation(request):
+    """
+    GET  /check_pronunciation?word=  -> listen on the server microphone
+    POST /check_pronunciation?word=  -> recording in the body (WAV)
+    Optional mode=spelling|pronunciation (default pronunciation).
+    """
+    import speech_recognition as sr
+
+    word = request.query.get("word", "").strip()
+    mode = request.query.get("mode", "pronunciation")
+    if not word:
+        return error("Missing 'word'", 400)
+    if mode not in MODES:
+        return error(f"Unknown mode {mode!r}", 400)
+
+    try:
+        if request.method == "POST":
+            data = await request.read()
+            if not data:
+                return error("Empty audio upload", 400)
+            transcripts = await offload(request, "threads", transcribe_upload, data, mode)
+        else:
+            transcripts = await offload(request, "devices", transcribe_microphone, mode)
+    except sr.WaitTimeoutError:
+        return error("No speech heard", 408)
+    except sr.RequestError as e:
+        return error(f"Speech service unavailable: {e}", 502)
+    except ValueError as e:
+        return error(f"Unreadable audio: {e}", 400)
+
+    if not transcripts:
+        return error("Didn't catch that.", 422)
+    feedback = await offload(request, "processes", score_attempt, word, transcripts, mode)
+    return web.json_response({"spoken_text": feedback["transcript"], "feedback": feedback})
+
+
+# --- App -----------------------------------------------------------------------
+
+def create_app(api_key=None, thread_workers=THREAD_WORKERS, process_workers=PROCESS_WORKERS):
+    """
+    :param api_key: Gemini key for the detection fallback (None: local tiers only)
+    :param thread_workers: Concurrent network-bound jobs (Gemini, gTTS, Google ASR)
+    :param process_workers: Concurrent scoring jobs
+    """
+    app = web.Application(middlewares=[cors_middleware], client_max_size=MAX_UPLOAD_BYTES)
+    app["api_key"] = api_key
+    app["pools"] = {
+        "threads": ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="api"),
+        # forkserver: forking this already-threaded process could copy a held lock into a child
+        "processes": ProcessPoolExecutor(max_workers=process_workers,
+                                         mp_context=multiprocessing.get_context("forkserver")),
+        "devices": ThreadPoolExecutor(max_workers=1, thread_name_prefix="device"),
+    }
+    app["slots"] = {
+        "threads": asyncio.Semaphore(thread_workers * QUEUE_PER_WORKER),
+        "processes": asyncio.Semaphore(process_workers * QUEUE_PER_WORKER),
+        "devices": asyncio.Semaphore(QUEUE_PER_WORKER),
+    }
+
+    async def start_scoring_workers(app):
+        # Spawn the scoring processes now, not on the first /check_pronunciation
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(app["pools"]["processes"], os.getpid)
+                               for _ in range(process_workers)))
+
+    async def shutdown_pools(app):
+        for pool in app["pools"].values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    app.on_startup.append(start_scoring_workers)
+    app.on_cleanup.append(shutdown_pools)
+    app.router.add_get("/detect", detect)
+    app.router.add_post("/detect", detect)
+    app.router.add_get("/speak", speak)
+    app.router.add_get("/check_pronunciation", check_pronunciation)
+    app.router.add_post("/check_pronunciation", check_pronunciation)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP API for the reading assistant web page.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--threads", type=int, default=THREAD_WORKERS)
+    parser.add_argument("--processes", type=int, default=PROCESS_WORKERS)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY") or None
+    if not api_key:
+        print("⚠️ GOOGLE_API_KEY not set; /detect will only use the cache and local classifier.")
+    web.run_app(create_app(api_key, args.threads, args.processes), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
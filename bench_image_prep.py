@@ -0,0 +1,72 @@
+"""
+Benchmark: camera JPEG -> Gemini payload, old pipeline vs. image_prep.
+
+    python bench_image_prep.py                 # synthetic 640x480 / 1280x720 / 1920x1080 frames
+    python bench_image_prep.py photos/*.jpg    # your own camera captures
+"""
+import base64
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from image_prep import prepare_jpeg
+
+REPEATS = 20
+
+
+def legacy_payload(data):
+    """What ui_app.py did before: full decode, resize to 800 wide, re-encode at 90, base64."""
+    frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    height, width = frame.shape[:2]
+    if width > 800:
+        scale = 800 / width
+        frame = cv2.resize(frame, (800, int(height * scale)))
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return base64.b64encode(buffer.tobytes())
+
+
+def new_payload(data):
+    return base64.b64encode(prepare_jpeg(data).jpeg)
+
+
+def synthetic_jpeg(width, height):
+    """Camera-like frame: smooth gradient background, a few shapes, sensor noise."""
+    rng = np.random.default_rng(width)
+    y, x = np.mgrid[0:height, 0:width]
+    frame = np.dstack([(x * 255 // width), (y * 255 // height), ((x + y) * 127 // (width + height))]).astype(np.uint8)
+    cv2.circle(frame, (width // 2, height // 2), height // 4, (40, 40, 200), -1)
+    cv2.rectangle(frame, (width // 8, height // 8), (width // 3, height // 3), (200, 200, 40), -1)
+    noisy = frame.astype(np.int16) + rng.normal(0, 6, frame.shape).astype(np.int16)
+    _, buffer = cv2.imencode('.jpg', np.clip(noisy, 0, 255).astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, 92])
+    return buffer.tobytes()
+
+
+def measure(fn, data):
+    fn(data)  # Warm up
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        payload = fn(data)
+    return (time.perf_counter() - start) / REPEATS * 1000, len(payload)
+
+
+def main():
+    if len(sys.argv) > 1:
+        samples = []
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                samples.append((path, f.read()))
+    else:
+        samples = [(f"synthetic {w}x{h}", synthetic_jpeg(w, h)) for w, h in ((640, 480), (1280, 720), (1920, 1080))]
+
+    print(f"{'image':<24}{'input KB':>10}{'old ms':>9}{'old KB':>9}{'new ms':>9}{'new KB':>9}")
+    for name, data in samples:
+        old_ms, old_bytes = measure(legacy_payload, data)
+        new_ms, new_bytes = measure(new_payload, data)
+        print(f"{name[:23]:<24}{len(data) / 1024:>10.1f}{old_ms:>9.2f}{old_bytes / 1024:>9.1f}"
+              f"{new_ms:>9.2f}{new_bytes / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
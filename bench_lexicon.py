@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: compiled letter lexicon vs. the per-call dict rebuilds it replaced.
+
+    python bench_lexicon.py
+"""
+import timeit
+
+from letter_lexicon import is_letter_variant, parse_letters
+
+TRANSCRIPTS = [
+    "SEE AY TEE",
+    "DEE OH GEE",
+    "PEE AITCH OH EN EE",
+    "DOUBLE U AY TEE EE AR",
+    "SEE OH EM PEE YOU TEE EE AR",
+    "B A N A N A SPACE S P L I T",
+]
+
+
+# --- Previous implementation, kept verbatim for comparison -----------------
+
+def legacy_phonetic_match(spoken_letter, target_letter):
+    spoken = spoken_letter.upper()
+    target = target_letter.upper()
+    if spoken == target: return True
+    phonetic_groups = {
+        'A': ['AY', 'EY'], 'B': ['BEE', 'BE'], 'C': ['SEE', 'SEA'],
+        'D': ['DEE'], 'E': ['EE'], 'F': ['EFF', 'EF'],
+        'G': ['GEE', 'JE'], 'H': ['AYCH', 'AITCH', 'HA'],
+        'I': ['EYE', 'AYE'], 'J': ['JAY'], 'K': ['KAY', 'CAY'],
+        'L': ['ELL', 'EL'], 'M': ['EM'], 'N': ['EN'],
+        'O': ['OH', 'OWE'], 'P': ['PEE', 'PE'],
+        'Q': ['CUE', 'KYU', 'QUE'], 'R': ['AR', 'ARE'],
+        'S': ['ESS', 'ES'], 'T': ['TEE', 'TE'],
+        'U': ['YOU', 'YUE'], 'V': ['VEE', 'VE'],
+        'W': ['DOUBLE-U', 'DOUBLEU'], 'X': ['EX'],
+        'Y': ['WHY', 'WYE'], 'Z': ['ZEE', 'ZED']
+    }
+    if target in phonetic_groups and spoken in phonetic_groups[target]:
+        return True
+    return False
+
+
+def legacy_extract_letters(spoken_text):
+    letter_names = {
+        'AY': 'A', 'BEE': 'B', 'SEE': 'C', 'DEE': 'D', 'EE': 'E',
+        'EFF': 'F', 'GEE': 'G', 'AYCH': 'H', 'EYE': 'I', 'JAY': 'J',
+        'KAY': 'K', 'ELL': 'L', 'EM': 'M', 'EN': 'N', 'OH': 'O',
+        'PEE': 'P', 'CUE': 'Q', 'AR': 'R', 'ESS': 'S', 'TEE': 'T',
+        'YOU': 'U', 'VEE': 'V', 'DOUBLE': 'W', 'EX': 'X', 'WHY': 'Y',
+        'ZEE': 'Z', 'ZED': 'Z', 'SPACE': ' '
+    }
+    words = spoken_text.upper().split()
+    recognized_letters = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word == 'DOUBLE' and i + 1 < len(words) and words[i+1] in ['U', 'YOU']:
+            recognized_letters.append('W')
+            i += 2; continue
+        if word in letter_names:
+            recognized_letters.append(letter_names[word])
+        elif len(word) == 1 and word.isalpha():
+            recognized_letters.append(word)
+        elif word == 'SPACE':
+            recognized_letters.append(' ')
+        elif word.isalpha():
+            recognized_letters.append(word[0])
+        i += 1
+    return recognized_letters
+
+
+# --- Workloads -------------------------------------------------------------
+
+def run_legacy():
+    for text in TRANSCRIPTS:
+        letters = legacy_extract_letters(text)
+        for spoken in letters:
+            for target in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+                legacy_phonetic_match(spoken, target)
+
+
+def run_compiled():
+    for text in TRANSCRIPTS:
+        letters = parse_letters(text.upper().split())
+        for spoken in letters:
+            for target in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+                is_letter_variant(spoken, target)
+
+
+def main(repeat=5, number=2000):
+    for text in TRANSCRIPTS:
+        old = "".join(legacy_extract_letters(text))
+        new = "".join(parse_letters(text.upper().split()))
+        if old != new:
+            print(f"ℹ️ {text!r}: legacy={old!r} compiled={new!r}")
+
+    legacy = min(timeit.repeat(run_legacy, repeat=repeat, number=number)) / number
+    compiled = min(timeit.repeat(run_compiled, repeat=repeat, number=number)) / number
+    print(f"legacy   : {legacy * 1e6:8.1f} µs per batch")
+    print(f"compiled : {compiled * 1e6:8.1f} µs per batch")
+    print(f"speedup  : {legacy / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
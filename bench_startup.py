@@ -0,0 +1,88 @@
+"""
+Benchmark: ui_app.py cold start and per-click rerun cost.
+
+    python bench_startup.py            # import times + 10 reruns
+    python bench_startup.py --reruns 50
+
+Import times are measured in fresh interpreters. Reruns use Streamlit's
+AppTest harness, which runs the script the way a button click does.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# What ui_app.py imported eagerly before heavy subsystems became lazy
+LEGACY_EAGER = [
+    "streamlit", "cv2", "google.generativeai", "dotenv", "PIL.ImageFont",
+    "numpy", "speech_recognition", "difflib", "gtts",
+]
+
+
+def eager_imports(path=os.path.join(HERE, "ui_app.py")):
+    """Modules ui_app.py imports at module level today."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def import_ms(modules):
+    """Wall time to import the modules in a fresh interpreter, or None if one is missing."""
+    code = ("import time; t = time.perf_counter()\n"
+            + "".join(f"import {m}\n" for m in modules)
+            + "print((time.perf_counter() - t) * 1000)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def rerun_ms(reruns):
+    """(first run ms, mean rerun ms) through streamlit.testing, or None if unavailable."""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return None
+    app = AppTest.from_file(os.path.join(HERE, "ui_app.py"), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    first = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(reruns):
+        app.run()
+    return first, (time.perf_counter() - start) * 1000 / max(1, reruns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    print("Cold import, one fresh interpreter per row:")
+    rows = [(m, [m]) for m in LEGACY_EAGER]
+    rows.append(("-- legacy eager set --", LEGACY_EAGER))
+    rows.append(("-- current ui_app.py set --", eager_imports()))
+    for name, modules in rows:
+        ms = import_ms(modules)
+        print(f"  {name:<30}{'not installed' if ms is None else f'{ms:9.1f} ms'}")
+
+    timings = rerun_ms(args.reruns)
+    if timings is None:
+        print("Reruns: streamlit.testing not available")
+    else:
+        first, rerun = timings
+        print(f"First run: {first:.1f} ms   rerun (one click): {rerun:.1f} ms over {args.reruns} reruns")
+
+
+if __name__ == "__main__":
+    main()
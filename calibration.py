@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+
+# ========================================
+# 🎚️ PERSISTENT AMBIENT-NOISE CALIBRATION
+# ========================================
+PROFILE_PATH = os.getenv(
+    "DYSLEXIA_NOISE_PROFILE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".noise_profiles.json"),
+)
+DYNAMIC_ENERGY_RATIO = 1.5  # Same ratio speech_recognition applies to the noise floor
+MIN_ENERGY_THRESHOLD = 50.0
+PROFILE_MAX_AGE = 2 * 60 * 60  # Recalibrate after two hours
+MAX_PROFILES = 1000
+
+
+class NoiseCalibrator:
+    def __init__(self, path=PROFILE_PATH, max_age=PROFILE_MAX_AGE, smoothing=0.2,
+                 max_profiles=MAX_PROFILES):
+        """
+        Per (session, device) noise floor, measured once and refined from silent frames.
+        :param path: JSON file the profiles persist to (None = memory only)
+        :param max_age: Seconds after which a profile is stale and re-measured
+        :param smoothing: EWMA weight given to each new noise observation
+        :param max_profiles: Oldest profiles are dropped past this count (expired ones always are)
+        """
+        self.path = path
+        self.max_age = max_age
+        self.smoothing = smoothing
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._profiles = self._load()
+        self._dirty = False
+        self._writer = None
+
+    @staticmethod
+    def key(session_id, device_index):
+        return f"{session_id}|{'default' if device_index is None else device_index}"
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as f:
+                profiles = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        self._purge_stale(profiles, time.time())
+        return profiles
+
+    def _purge_stale(self, profiles, now):
+        # Session ids are never reused, so an expired profile will never be read again
+        for key in [k for k, p in profiles.items() if now - p["measured_at"] > self.max_age]:
+            del profiles[key]
+
+    def _save_soon(self):
+        """Persist on a background thread so the practice attempt never waits on disk."""
+        if not self.path:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._writer is None:  # At most one writer; it clears itself under this lock
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            time.sleep(0.5)  # Coalesce bursts of updates into one write
+            with self._lock:
+                # Checked under the lock, so an update either lands here or starts a new writer
+                if not self._dirty:
+                    self._writer = None
+                    return
+                self._dirty = False
+                self._purge_stale(self._profiles, time.time())
+                snapshot = json.dumps(self._profiles)
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(snapshot)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ Could not save noise profiles: {e}")
+
+    def threshold(self, session_id, device_index=None):
+        """Stored energy threshold, or None if this session/device needs calibrating."""
+        with self._lock:
+            profile = self._profiles.get(self.key(session_id, device_index))
+        if profile is None or time.time() - profile["measured_at"] > self.max_age:
+            return None
+        return profile["energy_threshold"]
+
+    def record(self, session_id, device_index, energy_threshold):
+        """Store a full measurement (e.g. from adjust_for_ambient_noise)."""
+        noise_rms = energy_threshold / DYNAMIC_ENERGY_RATIO
+        now = time.time()
+        with self._lock:
+            self._purge_stale(self._profiles, now)
+            self._profiles[self.key(session_id, device_index)] = {
+                "noise_rms": noise_rms,
+                "energy_threshold": max(MIN_ENERGY_THRESHOLD, energy_threshold),
+                "measured_at": now,
+            }
+            if len(self._profiles) > self.max_profiles:
+                oldest = sorted(self._profiles, key=lambda k: self._profiles[k]["measured_at"])
+                for stale in oldest[:len(self._profiles) - self.max_profiles]:
+                    del self._profiles[stale]
+        self._save_soon()
+
+    def observe(self, session_id, device_index, noise_rms):
+        """Fold the RMS of frames the VAD judged silent into the stored floor."""
+        if noise_rms is None:
+            return
+        with self._lock:
+            profile = self._profiles.get(self.key(session_id, device_index))
+            if profile is None:
+                return
+            profile["noise_rms"] += self.smoothing * (noise_rms - profile["noise_rms"])
+            profile["energy_threshold"] = max(
+                MIN_ENERGY_THRESHOLD, profile["noise_rms"] * DYNAMIC_ENERGY_RATIO
+            )
+        self._save_soon()
+
+
+NOISE_PROFILES = NoiseCalibrator()
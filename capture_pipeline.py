@@ -0,0 +1,160 @@
+import queue
+import threading
+from collections import deque
+
+import numpy as np
+
+# ========================================
+# 🎥 THREADED CAPTURE / INFERENCE PIPELINE
+# ========================================
+# grabber thread -> FrameRing -> display loop -> InferenceWorker (bounded queue)
+# The display loop only ever reads the newest frame and never waits on the model.
+
+
+class FrameRing:
+    def __init__(self, capacity=2):
+        """
+        Newest camera frames; older ones are overwritten, never queued.
+        :param capacity: Frames kept (the display only reads the latest)
+        """
+        self._frames = deque(maxlen=capacity)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def put(self, frame):
+        with self._cond:
+            self._seq += 1
+            self._frames.append((self._seq, frame))
+            self._cond.notify_all()
+
+    def latest(self):
+        """(sequence number, frame), or (0, None) before the first frame."""
+        with self._cond:
+            return self._frames[-1] if self._frames else (0, None)
+
+    def wait_newer(self, seq, timeout=None):
+        """Block until a frame newer than seq arrives; returns latest() either way."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq, timeout=timeout)
+            return self._frames[-1] if self._frames else (0, None)
+
+
+class FrameGrabber(threading.Thread):
+    def __init__(self, capture, ring):
+        """
+        Reads the camera as fast as it delivers, so the driver buffer never lags behind.
+        :param capture: cv2.VideoCapture (anything with read() -> (ok, frame))
+        """
+        super().__init__(daemon=True, name="frame-grabber")
+        self.capture = capture
+        self.ring = ring
+        self.stopped = threading.Event()
+        self.failed = False
+
+    def run(self):
+        while not self.stopped.is_set():
+            ok, frame = self.capture.read()
+            if not ok:
+                self.failed = True
+                break
+            self.ring.put(frame)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class InferenceWorker(threading.Thread):
+    def __init__(self, detect, max_pending=1):
+        """
+        Runs detect(frame) off the display thread.
+        :param detect: Callable returning the detection text for one frame
+        :param max_pending: Frames allowed to wait; extra submissions are dropped
+        """
+        super().__init__(daemon=True, name="inference-worker")
+        self.detect = detect
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self.busy = False
+        self.result = None
+        self.error = None
+        self.completed = 0
+        self.dropped = 0
+
+    def submit(self, frame):
+        """Queue a frame without blocking; False if the queue is full."""
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            with self._lock:
+                self.busy = True
+            try:
+                result, error = self.detect(frame), None
+            except Exception as e:
+                result, error = None, e
+            with self._lock:
+                self.busy = False
+                self.result, self.error = result, error
+                self.completed += 1
+
+    def status(self):
+        """(busy, last result, last error, completed count) as one consistent snapshot."""
+        with self._lock:
+            return self.busy or not self._queue.empty(), self.result, self.error, self.completed
+
+    def stop(self):
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+
+class StabilityTrigger:
+    def __init__(self, stable_frames=15, threshold=3.0, step=8):
+        """
+        Fires once when the picture has held still for stable_frames frames, then
+        re-arms only after motion, so a held-up object is sent once, not every frame.
+        :param threshold: Mean absolute gray-level change per pixel that counts as motion
+        :param step: Subsampling stride; differencing every 8th pixel is plenty
+        """
+        self.stable_frames = stable_frames
+        self.threshold = threshold
+        self.step = step
+        self._previous = None
+        self._still = 0
+        self._armed = False  # Wait for motion first: an empty, static scene never fires
+
+    def _gray(self, frame):
+        small = np.asarray(frame)[::self.step, ::self.step]
+        if small.ndim == 3:
+            small = small[..., :3].mean(axis=2)
+        return small.astype(np.float32)
+
+    def motion(self, frame):
+        """Mean absolute difference to the previous frame (0 for the first one)."""
+        gray = self._gray(frame)
+        previous, self._previous = self._previous, gray
+        if previous is None or previous.shape != gray.shape:
+            return 0.0
+        return float(np.abs(gray - previous).mean())
+
+    def update(self, frame):
+        """Feed the next frame; True exactly when detection should fire."""
+        if self.motion(frame) > self.threshold:
+            self._still = 0
+            self._armed = True
+            return False
+        self._still += 1
+        if self._armed and self._still >= self.stable_frames:
+            self._armed = False
+            return True
+        return False
@@ -0,0 +1,154 @@
+import argparse
+import hashlib
+import json
+import os
+import string
+import threading
+
+from audio_cache import get_tts_cache
+from tts_engines import get_engine
+
+# ========================================
+# 🔤 PREBUILT ALPHABET CLIP BANK
+# ========================================
+BANK_VERSION = 2
+BANK_DIR = os.getenv(
+    "DYSLEXIA_CLIP_BANK_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "clip_bank"),
+)
+TOKENS = list(string.ascii_uppercase) + list(string.digits) + ["SPACE"]
+
+
+def token_for_char(char):
+    """Map one character of a word to its clip bank token (None = silent)."""
+    if char == ' ':
+        return "SPACE"
+    if char.isascii() and char.isalnum():
+        return char.upper()
+    return None
+
+
+def _variant_dir(lang, slow, bank_dir=BANK_DIR):
+    speed = "slow" if slow else "normal"
+    return os.path.join(bank_dir, f"v{BANK_VERSION}", f"{lang}-{speed}")
+
+
+class ClipBank:
+    def __init__(self, lang, slow, clips, directory):
+        """
+        Letter clips for one (lang, slow) variant, held in memory.
+        :param clips: Mapping of token -> encoded clip bytes (mp3 or wav)
+        :param directory: Where the clip files live on disk
+        """
+        self.lang = lang
+        self.slow = slow
+        self.clips = clips
+        self.directory = directory
+
+    def __contains__(self, token):
+        return token in self.clips
+
+    def data(self, token):
+        return self.clips[token]
+
+
+def build_clip_bank(lang='en', slow=False, bank_dir=BANK_DIR, force=False):
+    """Render every token for one variant and write its manifest."""
+    directory = _variant_dir(lang, slow, bank_dir)
+    os.makedirs(directory, exist_ok=True)
+    cache = get_tts_cache()
+    engine = get_engine()
+
+    preferred = engine.names()[0]
+
+    manifest = {"version": BANK_VERSION, "lang": lang, "slow": slow, "engine": preferred, "clips": {}}
+    for token in TOKENS:
+        path = os.path.join(directory, f"{token}.clip")
+        if force or not os.path.exists(path):
+            data, produced_by = cache.get_or_render(token, lang=lang, slow=slow, engine=engine)
+            if produced_by != preferred:
+                # A bank must be one voice; do not freeze an outage's fallback into it
+                raise RuntimeError(f"{preferred} is unavailable ({token} came from {produced_by}); "
+                                   f"try again later or set DYSLEXIA_TTS_ENGINE=local")
+            with open(path, "wb") as f:
+                f.write(data)
+        else:
+            with open(path, "rb") as f:
+                data = f.read()
+        manifest["clips"][token] = hashlib.sha256(data).hexdigest()
+
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+_loaded = {}  # (lang, slow, bank_dir) -> (manifest mtime, ClipBank)
+_loaded_lock = threading.Lock()
+
+
+def _read_bank(lang, slow, directory):
+    try:
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != BANK_VERSION:
+        return None
+
+    hashes = manifest.get("clips", {})
+    if set(hashes) != set(TOKENS):
+        return None
+    clips = {}
+    for token, digest in hashes.items():
+        try:
+            with open(os.path.join(directory, f"{token}.clip"), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            print(f"⚠️ Clip bank {directory}: {token}.clip is corrupt; rebuild with `python clip_bank.py --force`")
+            return None
+        clips[token] = data
+    return ClipBank(lang, slow, clips, directory)
+
+
+def load_clip_bank(lang='en', slow=False, bank_dir=BANK_DIR):
+    """
+    Load a built variant into memory, or return None if it is missing, stale or corrupt.
+    A loaded bank is reused until its manifest changes; misses are not remembered,
+    so a bank built while the app is running is picked up on the next call.
+    """
+    directory = _variant_dir(lang, slow, bank_dir)
+    try:
+        mtime = os.stat(os.path.join(directory, "manifest.json")).st_mtime_ns
+    except OSError:
+        return None
+    key = (lang, slow, bank_dir)
+    with _loaded_lock:
+        cached = _loaded.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    bank = _read_bank(lang, slow, directory)
+    with _loaded_lock:
+        if bank is None:
+            _loaded.pop(key, None)
+        else:
+            _loaded[key] = (mtime, bank)
+    return bank
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render the alphabet clip bank.")
+    parser.add_argument("--lang", action="append", help="Language code (repeatable, default 'en')")
+    parser.add_argument("--force", action="store_true", help="Re-render clips that already exist")
+    parser.add_argument("--bank-dir", default=BANK_DIR)
+    args = parser.parse_args(argv)
+
+    for lang in args.lang or ['en']:
+        for slow in (False, True):
+            directory = build_clip_bank(lang, slow, args.bank_dir, force=args.force)
+            print(f"✅ {len(TOKENS)} clips ready in {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+# ========================================
+# ⏳ BOUNDED, EXPIRING DEDUPE SET
+# ========================================
+
+
+class ExpiringLRU:
+    def __init__(self, maxsize=4096, ttl=3.0, clock=time.monotonic):
+        """
+        Set-like LRU whose entries expire after a fixed time.
+        :param maxsize: Maximum number of keys kept; least recently added go first
+        :param ttl: Seconds a key stays "seen"
+        :param clock: Monotonic time source (injectable for tests)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> expiry time, oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0    # Dropped to respect maxsize
+        self.expirations = 0  # Dropped because their TTL ran out
+
+    def _purge_expired(self, now):
+        # Entries are ordered by insertion and share one TTL, so expiry order matches
+        while self._entries:
+            key, expires = next(iter(self._entries.items()))
+            if expires > now:
+                break
+            del self._entries[key]
+            self.expirations += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            self._purge_expired(self.clock())
+            if key in self._entries:
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def _insert(self, key, now):
+        self._entries.pop(key, None)
+        self._entries[key] = now + self.ttl
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def add(self, key):
+        with self._lock:
+            now = self.clock()
+            self._purge_expired(now)
+            self._insert(key, now)
+
+    def check_and_add(self, key):
+        """
+        Return True if key was seen within the TTL, else mark it as seen.
+        A suppressed repeat does not extend the window.
+        """
+        # One lock hold: two racing callers cannot both see a miss
+        with self._lock:
+            now = self.clock()
+            self._purge_expired(now)
+            if key in self._entries:
+                self.hits += 1
+                return True
+            self.misses += 1
+            self._insert(key, now)
+            return False
+
+    def __len__(self):
+        with self._lock:
+            self._purge_expired(self.clock())
+            return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# ========================================
+# 🖼️ PERCEPTUAL-HASH DETECTION CACHE
+# ========================================
+HASH_WIDTH = 9   # dHash compares 9 columns -> 8 differences per row
+HASH_HEIGHT = 8  # 8 x 8 = 64-bit hash
+BANDS = 8        # Multi-index hashing: 8 bands of 8 bits each
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def dhash(frame):
+    """
+    64-bit difference hash of a BGR (or grayscale) frame, in pure NumPy.
+    The frame is area-averaged down to 9x8 gray cells and each bit says
+    whether a cell is brighter than its right-hand neighbour.
+    """
+    img = np.asarray(frame, dtype=np.float32)
+    if img.ndim == 3:
+        img = img[..., :3] @ np.array([0.114, 0.587, 0.299], dtype=np.float32)  # BGR -> luma
+    h, w = img.shape
+    rows = np.linspace(0, h, HASH_HEIGHT + 1).astype(np.int64)[:-1]
+    cols = np.linspace(0, w, HASH_WIDTH + 1).astype(np.int64)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(img, rows, axis=0), cols, axis=1)
+    counts = np.outer(np.diff(np.append(rows, h)), np.diff(np.append(cols, w)))
+    cells = sums / counts
+
+    bits = (cells[:, 1:] > cells[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+class DetectionCache:
+    def __init__(self, max_entries=2048, max_distance=6):
+        """
+        LRU of detection labels keyed by perceptual hash, with near-duplicate lookup.
+        :param max_entries: Oldest entries are evicted past this count
+        :param max_distance: Largest Hamming distance that still counts as "same
+                             frame"; must be below BANDS so one band matches exactly
+        """
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be < {BANDS}")
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries = OrderedDict()  # hash -> label
+        self._bands = [dict() for _ in range(BANDS)]  # band value -> set of hashes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _band_values(h):
+        return [(h >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+    def _nearest(self, h):
+        # Pigeonhole: within max_distance < BANDS, at least one band is identical
+        best, best_distance = None, self.max_distance + 1
+        for band, value in enumerate(self._band_values(h)):
+            for candidate in self._bands[band].get(value, ()):
+                distance = hamming(h, candidate)
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        return best
+
+    def _evict(self, h):
+        del self._entries[h]
+        for band, value in enumerate(self._band_values(h)):
+            bucket = self._bands[band][value]
+            bucket.discard(h)
+            if not bucket:
+                del self._bands[band][value]
+
+    def get(self, frame_hash):
+        """Label of the nearest cached frame, or None."""
+        with self._lock:
+            match = self._nearest(frame_hash)
+            if match is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(match)
+            self.hits += 1
+            return self._entries[match]
+
+    def put(self, frame_hash, label):
+        with self._lock:
+            if frame_hash in self._entries:
+                self._entries[frame_hash] = label
+                self._entries.move_to_end(frame_hash)
+                return
+            self._entries[frame_hash] = label
+            for band, value in enumerate(self._band_values(frame_hash)):
+                self._bands[band].setdefault(value, set()).add(frame_hash)
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+            }
+
+
+# Lives in this module so it survives Streamlit reruns of ui_app.py
+DETECTION_CACHE = DetectionCache()
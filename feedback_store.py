@@ -0,0 +1,207 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ========================================
+# 💡 PERSISTENT PRONUNCIATION-FEEDBACK STORE
+# ========================================
+DEFAULT_DB_PATH = os.getenv(
+    "DYSLEXIA_FEEDBACK_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".feedback.sqlite3"),
+)
+DEFAULT_MEMORY_ITEMS = 2048
+
+# Bump PROMPT_VERSION whenever FEEDBACK_PROMPT changes; older answers are then ignored
+PROMPT_VERSION = 1
+FEEDBACK_PROMPT = ("Explain how to pronounce '{word}' letter by letter for a dyslexic student. "
+                   "Simple English. No complex phonetics.")
+
+
+def feedback_prompt(word):
+    return FEEDBACK_PROMPT.format(word=word)
+
+
+def normalize_word(word):
+    return " ".join(word.split()).lower()
+
+
+class FeedbackStore:
+    def __init__(self, path=DEFAULT_DB_PATH, memory_items=DEFAULT_MEMORY_ITEMS, prompt_version=PROMPT_VERSION):
+        """
+        Generated explanations kept in SQLite (WAL mode), with an in-process LRU in front.
+        :param path: Database file; created on first use
+        :param memory_items: Explanations kept in memory
+        :param prompt_version: Only answers generated with this prompt version are returned
+        """
+        self.path = path
+        self.memory_items = memory_items
+        self.prompt_version = prompt_version
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # One connection per thread; WAL lets readers run alongside the writer
+        self.hits = 0
+        self.misses = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS feedback ("
+            " word TEXT NOT NULL, prompt_version INTEGER NOT NULL, text TEXT NOT NULL,"
+            " created_at REAL NOT NULL, PRIMARY KEY (word, prompt_version)) WITHOUT ROWID"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, word):
+        """Stored explanation for the word, or None."""
+        key = normalize_word(word)
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+
+        row = self._connect().execute(
+            "SELECT text FROM feedback WHERE word = ? AND prompt_version = ?",
+            (key, self.prompt_version),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, row[0])
+        return row[0]
+
+    def put(self, word, text):
+        key = normalize_word(word)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO feedback (word, prompt_version, text, created_at) VALUES (?, ?, ?, ?)",
+            (key, self.prompt_version, text, time.time()),
+        )
+        with self._lock:
+            self._remember(key, text)
+
+    def get_or_fetch(self, word, fetch):
+        """
+        Return the stored explanation, or call fetch(word) and store its answer.
+        Empty answers are returned but not stored, so a failed call is retried next time.
+        """
+        text = self.get(word)
+        if text is not None:
+            return text
+        text = fetch(word)
+        if text:
+            self.put(word, text)
+        return text
+
+    def __len__(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM feedback WHERE prompt_version = ?", (self.prompt_version,)
+        ).fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            return {"memory_items": len(self._memory), "hits": self.hits, "misses": self.misses}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_feedback_store():
+    """Process-wide store, so the LRU survives Streamlit reruns."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FeedbackStore()
+    return _store
+
+
+def fetch_feedback(word, api_key, session_id=None):
+    """Ask Gemini for an explanation, through the shared rate-limited gateway."""
+    from gemini_client import get_client, text_part
+    from gemini_gateway import get_gateway
+
+    parts = [text_part(feedback_prompt(word))]
+    return get_gateway().call(
+        ("feedback", PROMPT_VERSION, normalize_word(word)),
+        lambda: get_client(api_key).generate_text(parts, deadline=30),
+        session_id=session_id,
+    )
+
+
+def prewarm(words, api_key, concurrency=4, store=None):
+    """
+    Fetch explanations for every word not yet stored, at most `concurrency` at a time.
+    :return: (fetched, already stored, failed) counts
+    """
+    if store is None:
+        store = get_feedback_store()
+    unique = [w for w in dict.fromkeys(normalize_word(w) for w in words) if w]
+    pending = [w for w in unique if store.get(w) is None]
+    skipped = len(unique) - len(pending)
+    fetched = failed = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(fetch_feedback, word, api_key, "prewarm"): word for word in pending}
+        for future in as_completed(futures):
+            word = futures[future]
+            try:
+                text = future.result()
+            except Exception as e:
+                print(f"❌ {word}: {e}")
+                failed += 1
+                continue
+            if text:
+                store.put(word, text)
+                fetched += 1
+            else:
+                print(f"⚠️ {word}: empty answer")
+                failed += 1
+    return fetched, skipped, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-fetch pronunciation help for a word list.")
+    parser.add_argument("words", help="Text file with one word (or phrase) per line")
+    parser.add_argument("--concurrency", type=int, default=4, help="Gemini calls in flight at once")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    if not api_key:
+        parser.error("GOOGLE_API_KEY is not set")
+
+    with open(args.words, encoding="utf-8") as f:
+        words = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    start = time.perf_counter()
+    fetched, skipped, failed = prewarm(words, api_key, args.concurrency, FeedbackStore(args.db))
+    print(f"✅ {fetched} fetched, {skipped} already stored, {failed} failed "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import base64
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ========================================
+# 🌐 POOLED, RETRYING GEMINI REST CLIENT
+# ========================================
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+DEFAULT_MODEL = "gemini-2.5-flash"
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class GeminiError(Exception):
+    """Request failed for good (after retries, or on a non-retryable status)."""
+
+
+class CircuitOpenError(GeminiError):
+    """Too many recent failures; calls are refused until the breaker half-opens."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Classic closed -> open -> half-open breaker.
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param reset_timeout: Seconds to stay open before letting one trial call through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self.clock() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self.clock() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True  # Half-open: exactly one trial call
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+
+
+def text_part(text):
+    return {"text": text}
+
+
+def image_part(jpeg_bytes, mime_type="image/jpeg"):
+    return {"inline_data": {"mime_type": mime_type, "data": base64.b64encode(jpeg_bytes).decode("ascii")}}
+
+
+class GeminiClient:
+    def __init__(self, api_key, base_url=GEMINI_API_BASE, model=DEFAULT_MODEL, pool_size=16,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, breaker=None):
+        """
+        One keep-alive HTTP session for every Gemini call in the process.
+        :param base_url: API root (point it at a local stub server in tests)
+        :param pool_size: Connections kept open per host
+        :param max_retries: Retries after the first attempt for 429/5xx/network errors
+        :param backoff_base: First backoff in seconds; doubles per retry with full jitter
+        :param breaker: CircuitBreaker shared by all calls through this client
+        """
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json", "x-goog-api-key": api_key})
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def generate_content(self, parts, deadline=20.0, model=None):
+        """
+        POST :generateContent and return the decoded JSON.
+        :param parts: List of text_part()/image_part() dicts
+        :param deadline: Total seconds allowed, retries and backoff included
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Gemini circuit is open; skipping call")
+
+        url = f"{self.base_url}/models/{model or self.model}:generateContent"
+        payload = {"contents": [{"parts": parts}]}
+        give_up_at = time.monotonic() + deadline
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            retry_after = None
+            try:
+                response = self.session.post(url, json=payload, timeout=remaining)
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return response.json()
+                last_error = GeminiError(f"HTTP {response.status_code}: {response.text[:200]}")
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()  # The service answered; it is our request
+                    raise last_error
+                retry_after = response.headers.get("Retry-After")
+            except requests.RequestException as e:
+                last_error = GeminiError(f"{type(e).__name__}: {e}")
+
+            if attempt == self.max_retries:
+                break
+            pause = self._backoff(attempt, retry_after)
+            if time.monotonic() + pause >= give_up_at:
+                break
+            time.sleep(pause)
+
+        self.breaker.record_failure()
+        raise last_error or GeminiError("Deadline exceeded before the first attempt")
+
+    def generate_text(self, parts, deadline=20.0, model=None):
+        """Text of the first candidate, or None if the model returned none."""
+        data = self.generate_content(parts, deadline=deadline, model=model)
+        candidates = data.get("candidates", [])
+        if not candidates or "content" not in candidates[0]:
+            return None
+        return "".join(part.get("text", "") for part in candidates[0]["content"].get("parts", []))
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key, base_url=GEMINI_API_BASE):
+    """Process-wide client per key, so the connection pool survives Streamlit reruns."""
+    key = (api_key, base_url)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = GeminiClient(api_key, base_url=base_url)
+        return _clients[key]
@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# ========================================
+# 🚦 PROCESS-WIDE GEMINI GATEWAY
+# ========================================
+# Identical in-flight requests are coalesced into one upstream call, and
+# upstream calls are admitted by a token bucket, round-robin across sessions
+# so one busy classroom cannot starve another.
+DEFAULT_RATE_PER_SEC = 2.0
+DEFAULT_BURST = 5
+DEFAULT_WORKERS = 8
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic):
+        """
+        :param rate: Tokens added per second
+        :param burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self):
+        """Take a token if available; otherwise return seconds until one is."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class _Request:
+    __slots__ = ("key", "fn", "future", "enqueued_at")
+
+    def __init__(self, key, fn):
+        self.key = key
+        self.fn = fn
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class GeminiGateway:
+    def __init__(self, rate_per_sec=DEFAULT_RATE_PER_SEC, burst=DEFAULT_BURST,
+                 max_workers=DEFAULT_WORKERS, wait_samples=512):
+        """
+        :param rate_per_sec: Sustained upstream calls per second
+        :param burst: Calls allowed back-to-back after a quiet period
+        :param max_workers: Upstream calls running at the same time
+        :param wait_samples: Recent queue waits kept for the metrics
+        """
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # session -> deque of _Request, in round-robin order
+        self._inflight = {}           # key -> _Request (queued or running)
+        self._waits = deque(maxlen=wait_samples)
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True, name="gemini-gateway")
+        self._dispatcher.start()
+
+    def submit(self, key, fn, session_id=None):
+        """
+        Schedule fn() (an upstream call) and return a Future for its result.
+        Requests with the same key share one call while it is queued or running.
+        """
+        with self._cond:
+            existing = self._inflight.get(key)
+            if existing is not None:
+                self.coalesced += 1
+                return existing.future
+            request = _Request(key, fn)
+            self._inflight[key] = request
+            self._queues.setdefault(session_id, deque()).append(request)
+            self.submitted += 1
+            self._cond.notify()
+            return request.future
+
+    def call(self, key, fn, session_id=None, timeout=None):
+        """Blocking submit(); raises whatever fn raised."""
+        return self.submit(key, fn, session_id).result(timeout=timeout)
+
+    def _next_request(self):
+        # Round-robin: take from the first session, then move it to the back
+        session, queue = next(iter(self._queues.items()))
+        request = queue.popleft()
+        if queue:
+            self._queues.move_to_end(session)
+        else:
+            del self._queues[session]
+        return request
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while not self._queues:
+                    self._cond.wait()
+                delay = self.bucket.try_take()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+                request = self._next_request()
+                self._waits.append(time.monotonic() - request.enqueued_at)
+            self._executor.submit(self._run, request)
+
+    def _run(self, request):
+        try:
+            result = request.fn()
+        except BaseException as e:
+            outcome = (False, e)
+        else:
+            outcome = (True, result)
+        with self._cond:
+            self._inflight.pop(request.key, None)
+            self.completed += 1
+        if outcome[0]:
+            request.future.set_result(outcome[1])
+        else:
+            request.future.set_exception(outcome[1])
+
+    def metrics(self):
+        with self._cond:
+            waits = sorted(self._waits)
+            depth = {str(session): len(queue) for session, queue in self._queues.items()}
+            return {
+                "queue_depth": sum(depth.values()),
+                "queue_depth_by_session": depth,
+                "in_flight": len(self._inflight),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "completed": self.completed,
+                "wait_avg_s": sum(waits) / len(waits) if waits else 0.0,
+                "wait_p95_s": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            }
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Process-wide gateway shared by every Streamlit session."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = GeminiGateway()
+    return _gateway
@@ -0,0 +1,80 @@
+import base64
+import html
+import json
+import os
+
+# ========================================
+# ✨ CLIENT-SIDE HIGHLIGHT WIDGETS
+# ========================================
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "spell_widget.js")) as _f:
+    SPELL_WIDGET_JS = _f.read()
+
+FONT = '"Comic Sans MS", "Comfortaa", cursive'
+
+SPELL_WIDGET_CSS = f"""
+body {{ margin:0; font-family:{FONT}; background:transparent; }}
+#spell-word {{ text-align:center; letter-spacing:15px; margin:30px 0; }}
+#spell-word .letter {{ color:#FFFFFF; font-size:60px; font-weight:normal; }}
+#spell-word .letter.active {{ color:#FF4B4B; font-size:80px; font-weight:bold;
+                              text-shadow:2px 2px 4px rgba(0,0,0,0.3); }}
+#spell-final {{ display:none; text-align:center; margin:30px 0; }}
+#spell-final .word {{ font-size:72px; font-weight:bold; color:#2E86AB;
+                      text-shadow:2px 2px 6px rgba(0,0,0,0.3); letter-spacing:8px; }}
+#spell-final .hint {{ font-size:24px; color:#666; margin-top:15px; }}
+#spell-play {{ display:none; margin:0 auto; font-size:20px; border-radius:12px; }}
+"""
+
+WIDGET_HEIGHT = 220
+
+
+def spell_widget_html(track):
+    """
+    Self-contained page that plays a SpelledTrack and animates its letters.
+    Everything (word, audio, timings) is shipped in one payload.
+    """
+    payload = track.to_payload()
+    payload["audio"] = f"data:{track.mime};base64,{base64.b64encode(track.audio).decode('ascii')}"
+    data = json.dumps(payload).replace("</", "<\\/")
+    return f"""
+<style>{SPELL_WIDGET_CSS}</style>
+<div id="spell-word"></div>
+<div id="spell-final">
+    <div class="word">{html.escape(track.word)}</div>
+    <div class="hint">Now say it together! 👇</div>
+</div>
+<div style="text-align:center;"><button id="spell-play">▶️ Play</button></div>
+<script id="spell-data" type="application/json">{data}</script>
+<script>{SPELL_WIDGET_JS}</script>
+"""
+
+
+def render_spell_widget(track):
+    import streamlit.components.v1 as components
+    components.html(spell_widget_html(track), height=WIDGET_HEIGHT)
+
+
+# --- Practice word state -------------------------------------------------
+# The stylesheet is sent once per run; each state update only ships class names.
+WORD_STATE_CSS = """
+<style>
+.dra-word { text-align:center; margin:30px 0; background:rgba(255,255,255,0.1);
+            border-radius:20px; padding:25px; border:2px solid rgba(255,255,255,0.2); }
+.dra-word span { font-size:70px; font-weight:bold; margin:0 5px; color:#2E86AB; }
+.dra-word span.ok { color:#38ef7d; text-shadow:2px 2px 6px rgba(0,0,0,0.2); }
+.dra-word span.bad { color:#ff4b5c; text-shadow:2px 2px 6px rgba(0,0,0,0.2); }
+</style>
+"""
+
+
+def word_state_html(target_upper, match_results, is_final=False):
+    """Compact markup for the practice word; colors come from WORD_STATE_CSS."""
+    parts = []
+    for i, letter in enumerate(target_upper):
+        char = '&nbsp;&nbsp;' if letter == ' ' else html.escape(letter)
+        if i < len(match_results) and match_results[i] is True:
+            parts.append(f'<span class="ok">{char}</span>')
+        elif is_final:
+            parts.append(f'<span class="bad">{char}</span>')
+        else:
+            parts.append(f'<span>{char}</span>')
+    return f'<div class="dra-word">{"".join(parts)}</div>'
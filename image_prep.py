@@ -0,0 +1,118 @@
+import struct
+
+import cv2
+import numpy as np
+
+# ========================================
+# 🖼️ IMAGE PREP FOR THE VISION MODEL
+# ========================================
+# Gemini bills images in 768x768 tiles, so pixels beyond that only cost bytes
+MODEL_MAX_SIDE = 768
+MAX_PASSTHROUGH_BYTES = 300 * 1024
+JPEG_QUALITY = 80
+REDUCED_COLOR_FLAGS = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+# Start-of-frame markers carry the image size; C4 (DHT), C8 (JPG) and CC (DAC) do not
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+
+def jpeg_dimensions(data):
+    """
+    (width, height) read from the JPEG's SOF header without decoding any pixels.
+    :return: None if the data is not a JPEG or the header is malformed
+    """
+    if len(data) < 4 or data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    size = len(data)
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):  # End of image / start of scan before any SOF
+            return None
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        if marker in _SOF_MARKERS:
+            if pos + 9 > size:
+                return None
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
+
+
+class PreparedImage:
+    def __init__(self, jpeg, width, height, reencoded):
+        """
+        JPEG ready to send to the model.
+        :param reencoded: False when the camera's own bytes were passed through
+        """
+        self.jpeg = jpeg
+        self.width = width
+        self.height = height
+        self.reencoded = reencoded
+
+
+def reduction_factor(size, target):
+    """Largest libjpeg scale-down (1, 2, 4 or 8) that keeps size / factor >= target."""
+    factor = 1
+    for candidate in (2, 4, 8):
+        if size // candidate >= target:
+            factor = candidate
+    return factor
+
+
+def _decode(data, factor):
+    frame = cv2.imdecode(np.frombuffer(data, np.uint8), REDUCED_COLOR_FLAGS.get(factor, cv2.IMREAD_COLOR))
+    if frame is None:
+        raise ValueError("Could not decode camera image")
+    return frame
+
+
+def _fit(width, height, max_side):
+    scale = min(1.0, max_side / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _encode(frame, max_side, quality):
+    height, width = frame.shape[:2]
+    target = _fit(width, height, max_side)
+    if target != (width, height):
+        frame = cv2.resize(frame, target, interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return PreparedImage(buffer.tobytes(), target[0], target[1], True)
+
+
+def prepare_jpeg(data, max_side=MODEL_MAX_SIDE, max_bytes=MAX_PASSTHROUGH_BYTES, quality=JPEG_QUALITY):
+    """
+    Make camera JPEG bytes model-sized with as little work as possible.
+    Small enough images are passed through untouched. Larger ones are decoded
+    by libjpeg at 1/2, 1/4 or 1/8 scale (IDCT scaling, so most pixels are never
+    produced), then resized to fit and encoded once.
+    """
+    dims = jpeg_dimensions(data)
+    if dims and max(dims) <= max_side and len(data) <= max_bytes:
+        return PreparedImage(bytes(data), dims[0], dims[1], False)
+
+    factor = reduction_factor(max(dims), max_side) if dims else 1
+    return _encode(_decode(data, factor), max_side, quality)
+
+
+def prepare_frame(frame, max_side=MODEL_MAX_SIDE, quality=JPEG_QUALITY):
+    """Model-sized JPEG from an already decoded BGR frame (e.g. a webcam grab)."""
+    return _encode(frame, max_side, quality)
+
+
+def decode_reduced(data, min_side):
+    """Decode at the smallest libjpeg scale whose short side is still >= min_side."""
+    dims = jpeg_dimensions(data)
+    return _decode(data, reduction_factor(min(dims), min_side) if dims else 1)
@@ -0,0 +1,85 @@
+import string
+
+# ========================================
+# 🔠 COMPILED LETTER-NAME LEXICON
+# ========================================
+# Everything a child (or the recognizer) may say for each letter. Built into
+# lookup tables once at import; spelling parsing is then one linear pass.
+LETTER_VARIANTS = {
+    'A': ['AY', 'EY'], 'B': ['BEE', 'BE'], 'C': ['SEE', 'SEA'],
+    'D': ['DEE'], 'E': ['EE'], 'F': ['EFF', 'EF'],
+    'G': ['GEE', 'JE'], 'H': ['AYCH', 'AITCH', 'HA'],
+    'I': ['EYE', 'AYE'], 'J': ['JAY'], 'K': ['KAY', 'CAY'],
+    'L': ['ELL', 'EL'], 'M': ['EM'], 'N': ['EN'],
+    'O': ['OH', 'OWE'], 'P': ['PEE', 'PE'],
+    'Q': ['CUE', 'KYU', 'QUE'], 'R': ['AR', 'ARE'],
+    'S': ['ESS', 'ES'], 'T': ['TEE', 'TE'],
+    'U': ['YOU', 'YUE'], 'V': ['VEE', 'VE'],
+    'W': ['DOUBLE U', 'DOUBLE YOU', 'DOUBLE-U', 'DOUBLEU', 'DOUBLE'],
+    'X': ['EX'], 'Y': ['WHY', 'WYE'], 'Z': ['ZEE', 'ZED'],
+    ' ': ['SPACE'],
+}
+
+_END = object()  # Trie key marking "a letter name ends here"
+
+
+def _compile():
+    reverse = {}
+    variants_by_letter = {}
+    trie = {}
+    for letter, variants in LETTER_VARIANTS.items():
+        variants_by_letter[letter] = frozenset(variants)
+        for variant in variants:
+            reverse[variant] = letter
+            node = trie
+            for token in variant.split():
+                node = node.setdefault(token, {})
+            node[_END] = letter
+    return reverse, variants_by_letter, trie
+
+
+# Spoken variant (e.g. "DOUBLE U") -> letter
+REVERSE_INDEX, VARIANTS_BY_LETTER, TOKEN_TRIE = _compile()
+
+# Vocabulary for recognizers that accept a grammar (lowercase words only)
+SPELLING_GRAMMAR = sorted(
+    {v.lower() for v in REVERSE_INDEX if v.replace(' ', '').isalpha() and v != 'DOUBLE'}
+    | set(string.ascii_lowercase)
+)
+
+
+def is_letter_variant(spoken, letter):
+    """True if `spoken` is the letter itself or one of its names."""
+    return spoken == letter or spoken in VARIANTS_BY_LETTER.get(letter, ())
+
+
+def parse_letters(tokens):
+    """
+    Map a token sequence to letters in a single left-to-right pass.
+    Multi-word names ("DOUBLE U") take the longest match through the trie;
+    unknown alphabetic words fall back to their first letter.
+    """
+    letters = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        node = TOKEN_TRIE
+        j = i
+        match = None
+        match_end = i
+        while j < n and tokens[j] in node:
+            node = node[tokens[j]]
+            j += 1
+            if _END in node:
+                match, match_end = node[_END], j
+
+        if match is not None:
+            letters.append(match)
+            i = match_end
+            continue
+
+        token = tokens[i]
+        if token.isalpha():
+            letters.append(token[0])  # Single letters map to themselves
+        i += 1
+    return letters
@@ -0,0 +1,88 @@
+import os
+import threading
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+# ========================================
+# 🧠 LOCAL CPU IMAGE CLASSIFIER (OpenCV DNN)
+# ========================================
+# Any ImageNet-style ONNX classifier works, e.g. MobileNetV2 from the ONNX
+# model zoo, with a labels file holding one class name per line.
+_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+CLASSIFIER_MODEL_PATH = os.getenv("DYSLEXIA_CLASSIFIER_MODEL", os.path.join(_MODELS_DIR, "classifier.onnx"))
+CLASSIFIER_LABELS_PATH = os.getenv("DYSLEXIA_CLASSIFIER_LABELS", os.path.join(_MODELS_DIR, "classifier_labels.txt"))
+INPUT_SIZE = 224
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def load_labels(path):
+    """
+    Class names, one per line. "n07742313 Granny Smith" and "tabby, tabby cat"
+    style lines are reduced to their first readable name.
+    """
+    labels = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            name = line.strip()
+            if name[:1] == "n" and name[1:9].isdigit() and name[9:10] == " ":
+                name = name[10:]
+            labels.append(name.split(",")[0].strip().replace("_", " ").title())
+    return labels
+
+
+class LocalClassifier:
+    def __init__(self, model_path=CLASSIFIER_MODEL_PATH, labels_path=CLASSIFIER_LABELS_PATH,
+                 input_size=INPUT_SIZE):
+        """
+        ONNX classifier run through cv2.dnn on the CPU.
+        :param input_size: Square input side the network expects
+        """
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.labels = load_labels(labels_path)
+        self.input_size = input_size
+        self._lock = threading.Lock()  # cv2.dnn.Net is not safe to call from several threads
+
+    def _blob(self, frame):
+        # Center crop to a square, then BGR -> RGB, scale to [0, 1] and normalize
+        h, w = frame.shape[:2]
+        side = min(h, w)
+        top, left = (h - side) // 2, (w - side) // 2
+        crop = cv2.resize(frame[top:top + side, left:left + side], (self.input_size, self.input_size),
+                          interpolation=cv2.INTER_AREA)
+        rgb = crop[..., ::-1].astype(np.float32) / 255.0
+        normalized = (rgb - IMAGENET_MEAN) / IMAGENET_STD
+        return np.ascontiguousarray(normalized.transpose(2, 0, 1)[np.newaxis])
+
+    def classify(self, frame):
+        """
+        Top-1 prediction for a BGR frame.
+        :return: (label, confidence in [0, 1])
+        """
+        blob = self._blob(frame)
+        with self._lock:
+            self.net.setInput(blob)
+            scores = self.net.forward().reshape(-1).astype(np.float64)
+        # Some exports end in softmax, most return logits
+        if scores.min() < 0 or abs(scores.sum() - 1.0) > 1e-3:
+            scores = np.exp(scores - scores.max())
+            scores /= scores.sum()
+        best = int(scores.argmax())
+        label = self.labels[best] if best < len(self.labels) else str(best)
+        return label, float(scores[best])
+
+
+@lru_cache(maxsize=1)
+def get_local_classifier():
+    """Loaded once per process; None when no model is installed."""
+    if not (os.path.exists(CLASSIFIER_MODEL_PATH) and os.path.exists(CLASSIFIER_LABELS_PATH)):
+        return None
+    try:
+        return LocalClassifier()
+    except cv2.error as e:
+        print(f"⚠️ Local classifier could not be loaded: {e}")
+        return None
@@ -0,0 +1,277 @@
+import mmap
+import os
+import threading
+from functools import lru_cache
+
+# ========================================
+# 🗣️ LOCAL GRAPHEME-TO-PHONEME INDEX
+# ========================================
+# CMUdict-format lexicon ("WORD  P1 P2 ..."), e.g. from
+# https://github.com/cmusphinx/cmudict. Without it the rule engine below is used.
+LEXICON_PATH = os.getenv(
+    "DYSLEXIA_LEXICON_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cmudict.dict"),
+)
+
+VOWELS = frozenset(["AA", "AE", "AH", "AO", "AW", "AY", "EH", "ER", "EY", "IH", "IY", "OW", "OY", "UH", "UW"])
+
+
+class PronunciationLexicon:
+    def __init__(self, path=LEXICON_PATH):
+        """
+        Memory-mapped CMUdict lookups. The file is mapped and indexed on first
+        use only; afterwards each lookup is a dict hit plus one slice.
+        :param path: Lexicon file; a missing file simply means "no entries"
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._offsets = None  # WORD -> (start, end) of its phoneme field
+
+    def _load(self):
+        with self._lock:
+            if self._offsets is not None:
+                return
+            offsets = {}
+            try:
+                with open(self.path, "rb") as f:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._offsets = offsets
+                return
+
+            pos = 0
+            size = len(data)
+            while pos < size:
+                end = data.find(b"\n", pos)
+                if end < 0:
+                    end = size
+                split = data.find(b" ", pos, end)
+                if split > pos and data[pos:pos + 3] != b";;;":
+                    word = data[pos:split].decode("utf-8", "replace").upper()
+                    if "(" not in word and word not in offsets:  # First variant only
+                        offsets[word] = (split + 1, end)
+                pos = end + 1
+            self._mmap = data
+            self._offsets = offsets
+
+    def __contains__(self, word):
+        if self._offsets is None:
+            self._load()
+        return word.upper() in self._offsets
+
+    def phonemes(self, word):
+        """Phonemes without stress marks, or None if the word is not listed."""
+        if self._offsets is None:
+            self._load()
+        span = self._offsets.get(word.upper())
+        if span is None:
+            return None
+        raw = self._mmap[span[0]:span[1]].decode("ascii", "replace").split("#")[0]
+        return tuple(p.rstrip("012") for p in raw.split())
+
+
+LEXICON = PronunciationLexicon()
+
+
+# --- Rule-based fallback -------------------------------------------------
+# Each rule maps a grapheme to phonemes; graphemes are matched longest first.
+GRAPHEME_RULES = {
+    "TCH": ("CH",), "IGH": ("AY",), "EIGH": ("EY",), "DGE": ("JH",),
+    "TH": ("TH",), "SH": ("SH",), "CH": ("CH",), "PH": ("F",), "WH": ("W",),
+    "CK": ("K",), "NG": ("NG",), "QU": ("K", "W"), "GH": (),
+    "EE": ("IY",), "EA": ("IY",), "OO": ("UW",), "OU": ("AW",), "OW": ("OW",),
+    "AI": ("EY",), "AY": ("EY",), "OA": ("OW",), "OI": ("OY",), "OY": ("OY",),
+    "AU": ("AO",), "AW": ("AO",), "EW": ("UW",), "IE": ("IY",),
+    "ER": ("ER",), "IR": ("ER",), "UR": ("ER",), "AR": ("AA", "R"), "OR": ("AO", "R"),
+    "A": ("AE",), "B": ("B",), "C": ("K",), "D": ("D",), "E": ("EH",), "F": ("F",),
+    "G": ("G",), "H": ("HH",), "I": ("IH",), "J": ("JH",), "K": ("K",), "L": ("L",),
+    "M": ("M",), "N": ("N",), "O": ("AA",), "P": ("P",), "Q": ("K",), "R": ("R",),
+    "S": ("S",), "T": ("T",), "U": ("AH",), "V": ("V",), "W": ("W",), "X": ("K", "S"),
+    "Y": ("IH",), "Z": ("Z",),
+}
+WORD_INITIAL_RULES = {"KN": ("N",), "WR": ("R",), "GN": ("N",), "PS": ("S",), "Y": ("Y",)}
+LONG_VOWELS = {"A": ("EY",), "E": ("IY",), "I": ("AY",), "O": ("OW",), "U": ("UW",)}
+MAX_GRAPHEME = max(len(g) for g in GRAPHEME_RULES)
+_VOWEL_LETTERS = frozenset("AEIOU")
+
+
+@lru_cache(maxsize=65536)
+def rule_chunks(word):
+    """
+    Split a word into grapheme chunks with their phonemes.
+    :return: Tuple of (first letter index, last letter index + 1, phonemes)
+    """
+    word = word.upper()
+    n = len(word)
+    # Magic e: vowel + one consonant + final E makes the vowel long and the E silent
+    magic = n >= 3 and word[-1] == "E" and word[-2] not in _VOWEL_LETTERS and word[-3] in _VOWEL_LETTERS
+
+    chunks = []
+    i = 0
+    while i < n:
+        if not word[i].isalpha():
+            chunks.append((i, i + 1, ()))
+            i += 1
+            continue
+        if i > 0 and word[i] == word[i - 1] and word[i] not in _VOWEL_LETTERS:
+            chunks.append((i, i + 1, ()))  # Doubled consonant is one sound
+            i += 1
+            continue
+        if magic and i == n - 1:
+            chunks.append((i, i + 1, ()))
+            break
+        if magic and i == n - 3:
+            chunks.append((i, i + 1, LONG_VOWELS[word[i]]))
+            i += 1
+            continue
+
+        for size in range(min(MAX_GRAPHEME, n - i), 0, -1):
+            grapheme = word[i:i + size]
+            if i == 0 and grapheme in WORD_INITIAL_RULES:
+                phonemes = WORD_INITIAL_RULES[grapheme]
+                break
+            if grapheme in GRAPHEME_RULES:
+                phonemes = GRAPHEME_RULES[grapheme]
+                if grapheme == "C" and word[i + 1:i + 2] in ("E", "I", "Y"):
+                    phonemes = ("S",)
+                elif grapheme == "Y" and i == n - 1:
+                    phonemes = ("AY",) if n <= 3 else ("IY",)
+                break
+        else:
+            size, phonemes = 1, ()
+        chunks.append((i, i + size, phonemes))
+        i += size
+    return tuple(chunks)
+
+
+# --- Alignment -------------------------------------------------------------
+
+def _phoneme_cost(a, b):
+    if a == b:
+        return 0.0
+    return 0.6 if (a in VOWELS) == (b in VOWELS) else 1.0
+
+
+def align(source, target):
+    """
+    Edit-distance alignment of two phoneme sequences.
+    :return: List of (source index or None, target index or None) pairs
+    """
+    n, m = len(source), len(target)
+    D = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        D[i][0] = float(i)
+    for j in range(1, m + 1):
+        D[0][j] = float(j)
+    for i in range(1, n + 1):
+        row, prev = D[i], D[i - 1]
+        for j in range(1, m + 1):
+            row[j] = min(prev[j - 1] + _phoneme_cost(source[i - 1], target[j - 1]),
+                         prev[j] + 1.0, row[j - 1] + 1.0)
+
+    pairs = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and D[i][j] == D[i - 1][j - 1] + _phoneme_cost(source[i - 1], target[j - 1]):
+            pairs.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif i > 0 and D[i][j] == D[i - 1][j] + 1.0:
+            pairs.append((i - 1, None))
+            i -= 1
+        else:
+            pairs.append((None, j - 1))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+@lru_cache(maxsize=65536)
+def word_chunks(word):
+    """
+    Grapheme chunks carrying the best available phonemes: the lexicon's when the
+    word is listed (attributed to letters by aligning with the rule output),
+    otherwise the rules' own.
+    """
+    chunks = rule_chunks(word)
+    listed = LEXICON.phonemes(word)
+    if listed is None:
+        return chunks
+
+    rule_phonemes = []
+    owner = []
+    for index, (_, _, phonemes) in enumerate(chunks):
+        rule_phonemes.extend(phonemes)
+        owner.extend([index] * len(phonemes))
+
+    assigned = [[] for _ in chunks]
+    current = None  # Chunk owning the most recently aligned rule phoneme
+    leading = []    # Lexicon phonemes aligned before any rule phoneme
+    for rule_i, listed_i in align(rule_phonemes, listed):
+        if rule_i is not None:
+            current = owner[rule_i]
+        if listed_i is None:
+            continue
+        if current is None:
+            leading.append(listed[listed_i])
+        else:
+            assigned[current].append(listed[listed_i])
+    if leading:
+        first = owner[0] if owner else 0
+        assigned[first] = leading + assigned[first]
+    return tuple((start, end, tuple(p)) for (start, end, _), p in zip(chunks, assigned))
+
+
+@lru_cache(maxsize=65536)
+def word_phonemes(word):
+    listed = LEXICON.phonemes(word)
+    if listed is not None:
+        return listed
+    return tuple(p for _, _, phonemes in rule_chunks(word) for p in phonemes)
+
+
+# --- Scoring ---------------------------------------------------------------
+
+def score_pronunciation(target_upper, transcript):
+    """
+    Per-letter correctness of a spoken transcript against the target, judged
+    on phonemes: homophones ("KNIGHT" / "NIGHT") score as fully correct and
+    each phoneme error is mapped back onto the letters that spell it.
+    """
+    spoken = [p for w in transcript.upper().split() for p in word_phonemes(w)]
+    if not spoken:
+        return [False] * len(target_upper)
+
+    # Flatten the target's chunks across its words, remembering letter spans
+    spans = []
+    target_phonemes = []
+    owner = []
+    offset = 0
+    for word in target_upper.split(" "):
+        for start, end, phonemes in word_chunks(word):
+            target_phonemes.extend(phonemes)
+            owner.extend([len(spans)] * len(phonemes))
+            spans.append((offset + start, offset + end, len(phonemes)))
+        offset += len(word) + 1
+
+    hits = [0] * len(spans)
+    for t_i, s_i in align(target_phonemes, spoken):
+        if t_i is not None and s_i is not None and target_phonemes[t_i] == spoken[s_i]:
+            hits[owner[t_i]] += 1
+
+    chunk_ok = [count > 0 and hits[k] == count for k, (_, _, count) in enumerate(spans)]
+    # Silent letters follow their neighbour: the previous sounded chunk, else the next one
+    sounded = [k for k, (_, _, count) in enumerate(spans) if count]
+    if sounded:
+        previous = chunk_ok[sounded[0]]
+        for k, (_, _, count) in enumerate(spans):
+            if count:
+                previous = chunk_ok[k]
+            else:
+                chunk_ok[k] = previous
+
+    match_results = [True if c == ' ' else False for c in target_upper]
+    for (start, end, _), ok in zip(spans, chunk_ok):
+        for i in range(start, end):
+            match_results[i] = ok
+    return match_results
@@ -0,0 +1,93 @@
+"""
+Re-score an archive of practice attempts.
+
+Input is JSONL, one attempt per line:
+    {"id": "a1", "target": "CAT", "transcript": "SEE AY TEE", "mode": "spelling"}
+`transcript` may also be a list of alternatives; `mode` defaults to --mode.
+
+    python score_corpus.py attempts.jsonl -o scores.jsonl --workers 8
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from scoring import score_attempt
+
+_default_mode = "spelling"
+
+
+def _init_worker(default_mode):
+    global _default_mode
+    _default_mode = default_mode
+
+
+def score_line(numbered_line):
+    """Worker: parse and score one JSONL line; errors become result records."""
+    line_no, line = numbered_line
+    try:
+        record = json.loads(line)
+        result = score_attempt(
+            record["target"], record.get("transcript", ""), record.get("mode", _default_mode)
+        )
+        if "id" in record:
+            result["id"] = record["id"]
+    except Exception as e:
+        result = {"line": line_no, "error": f"{type(e).__name__}: {e}"}
+    return json.dumps(result)
+
+
+def _numbered_lines(stream):
+    for line_no, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_no, line
+
+
+def score_stream(src, dst, workers=None, chunksize=256, default_mode="spelling"):
+    """
+    Score every line of `src` into `dst`, in input order.
+    Input is read in fixed windows so memory stays flat however large the corpus is.
+    :return: Number of records written
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * chunksize * 4
+    lines = _numbered_lines(src)
+    written = 0
+    with Pool(workers, initializer=_init_worker, initargs=(default_mode,)) as pool:
+        while True:
+            batch = list(itertools.islice(lines, window))
+            if not batch:
+                break
+            for result in pool.imap(score_line, batch, chunksize=chunksize):
+                dst.write(result + "\n")
+                written += 1
+            dst.flush()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score spelling/pronunciation transcripts.")
+    parser.add_argument("input", help="JSONL corpus ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Where to write results ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=256)
+    parser.add_argument("--mode", choices=["spelling", "pronunciation"], default="spelling",
+                        help="Mode for records that do not specify one")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count = score_stream(src, dst, args.workers, args.chunksize, args.mode)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(f"✅ Scored {count} attempts", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
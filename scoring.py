@@ -0,0 +1,64 @@
+from letter_lexicon import parse_letters
+from pronunciation_index import score_pronunciation
+from spelling_scorer import score_spelling
+
+# ========================================
+# 📊 PURE SCORING API (no microphone, no Streamlit)
+# ========================================
+MODES = ("spelling", "pronunciation")
+
+
+def match_spelling(target_upper, spoken_text):
+    """Per-letter correctness of a spelled-out transcript (optimal alignment)."""
+    return score_spelling(target_upper, [parse_letters(spoken_text.upper().split())])[1]
+
+
+def match_pronunciation(target_upper, spoken_text):
+    """Per-letter correctness of a spoken word, compared phoneme by phoneme."""
+    return score_pronunciation(target_upper, spoken_text)
+
+
+def choose_transcript(target_upper, transcripts, mode="spelling"):
+    """
+    Score every alternative transcript and keep the best one.
+    :return: (transcript, match_results)
+    """
+    if not transcripts:
+        return "", [False] * len(target_upper)
+    if mode == "spelling":
+        hypotheses = [parse_letters(t.upper().split()) for t in transcripts]
+        best, match_results = score_spelling(target_upper, hypotheses)
+        return transcripts[best], match_results
+    scored = [(sum(match_pronunciation(target_upper, t)), -rank, t) for rank, t in enumerate(transcripts)]
+    _, _, best_text = max(scored)
+    return best_text, match_pronunciation(target_upper, best_text)
+
+
+def score_attempt(target, transcript, mode="spelling"):
+    """
+    Score one practice attempt.
+    :param target: Word the student was asked to spell or say
+    :param transcript: Recognized text, or a list of alternative transcripts
+    :param mode: "spelling" or "pronunciation"
+    :return: Dict with the chosen transcript and per-letter results
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+    target_upper = target.upper().strip()
+    transcripts = [transcript] if isinstance(transcript, str) else list(transcript)
+    transcripts = [t.upper() for t in transcripts]
+
+    chosen, match_results = choose_transcript(target_upper, transcripts, mode)
+    correct = sum(match_results)
+    return {
+        "target": target_upper,
+        "mode": mode,
+        "transcript": chosen,
+        "letters": [
+            {"index": i, "letter": letter, "correct": ok}
+            for i, (letter, ok) in enumerate(zip(target_upper, match_results))
+        ],
+        "correct": correct,
+        "total": len(target_upper),
+        "accuracy": correct / len(target_upper) if target_upper else 0.0,
+    }
@@ -9,14 +9,16 @@ document.getElementById("detectBtn").onclick = async () => {
 document.getElementById("speakBtn").onclick = async () => {
   const object = document.getElementById("objectName").innerText.split(": ")[1];
   if (object && object !== "—") {
-    await fetch(`${backend}/speak?word=${object}`);
+    // The server returns the audio; the browser streams, caches and plays it
+    const audio = new Audio(`${backend}/speak?word=${encodeURIComponent(object)}`);
+    await audio.play();
   }
 };
 
 document.getElementById("checkBtn").onclick = async () => {
   const object = document.getElementById("objectName").innerText.split(": ")[1];
   if (object && object !== "—") {
-    const res = await fetch(`${backend}/check_pronunciation?word=${object}`);
+    const res = await fetch(`${backend}/check_pronunciation?word=${encodeURIComponent(object)}`);
     const data = await res.json();
 
     if (data.error) {
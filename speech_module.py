@@ -1,26 +1,25 @@
 import speech_recognition as sr
 import streamlit as st
 import time
-from gtts import gTTS
-import tempfile
 import os
-import difflib
+
+from audio_delivery import deliver_clip
+from audio_cache import get_tts_cache
+from highlight_widget import WORD_STATE_CSS, word_state_html
+from calibration import NOISE_PROFILES
+from scoring import choose_transcript, match_pronunciation, match_spelling
+from letter_lexicon import SPELLING_GRAMMAR, is_letter_variant, parse_letters
+from vad import EnergyVAD, listen_with_vad
+from streaming_asr import StreamingRecognizer, stream_microphone, vosk_available
 
 def play_sound(text, slow=False):
-    """Helper function to play audio feedback"""
+    """Helper function to play audio feedback (returns once it has finished, so the mic won't hear it)"""
     try:
-        tts = gTTS(text=text, lang='en', slow=slow)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
-            tts.save(f.name)
-            try:
-                from playsound import playsound
-                playsound(f.name)
-            except:
-                pass
-            try:
-                os.remove(f.name)
-            except:
-                pass
+        data = get_tts_cache().get_or_synthesize(text, lang='en', slow=slow)
+        try:
+            deliver_clip(data, wait=True)
+        except:
+            pass
     except Exception as e:
         pass
 
@@ -29,69 +28,21 @@ def phonetic_match(spoken_letter, target_letter):
     Check if spoken letter matches target letter.
     STRICT MODE: Only accepts the letter or its specific phonetic name.
     """
-    spoken = spoken_letter.upper()
-    target = target_letter.upper()
-    
-    if spoken == target: return True
-    
-    phonetic_groups = {
-        'A': ['AY', 'EY'], 'B': ['BEE', 'BE'], 'C': ['SEE', 'SEA'],
-        'D': ['DEE'], 'E': ['EE'], 'F': ['EFF', 'EF'],
-        'G': ['GEE', 'JE'], 'H': ['AYCH', 'AITCH', 'HA'],
-        'I': ['EYE', 'AYE'], 'J': ['JAY'], 'K': ['KAY', 'CAY'],
-        'L': ['ELL', 'EL'], 'M': ['EM'], 'N': ['EN'],
-        'O': ['OH', 'OWE'], 'P': ['PEE', 'PE'],
-        'Q': ['CUE', 'KYU', 'QUE'], 'R': ['AR', 'ARE'],
-        'S': ['ESS', 'ES'], 'T': ['TEE', 'TE'],
-        'U': ['YOU', 'YUE'], 'V': ['VEE', 'VE'],
-        'W': ['DOUBLE-U', 'DOUBLEU'], 'X': ['EX'],
-        'Y': ['WHY', 'WYE'], 'Z': ['ZEE', 'ZED']
-    }
-    
-    if target in phonetic_groups and spoken in phonetic_groups[target]:
-        return True
-    return False
+    return is_letter_variant(spoken_letter.upper(), target_letter.upper())
 
 def extract_letters_from_speech(spoken_text, target_length):
     """
     Extracts explicit letters from speech.
     """
-    letter_names = {
-        'AY': 'A', 'BEE': 'B', 'SEE': 'C', 'DEE': 'D', 'EE': 'E',
-        'EFF': 'F', 'GEE': 'G', 'AYCH': 'H', 'EYE': 'I', 'JAY': 'J',
-        'KAY': 'K', 'ELL': 'L', 'EM': 'M', 'EN': 'N', 'OH': 'O',
-        'PEE': 'P', 'CUE': 'Q', 'AR': 'R', 'ESS': 'S', 'TEE': 'T',
-        'YOU': 'U', 'VEE': 'V', 'DOUBLE': 'W', 'EX': 'X', 'WHY': 'Y',
-        'ZEE': 'Z', 'ZED': 'Z', 'SPACE': ' '
-    }
-    
-    words = spoken_text.upper().split()
-    recognized_letters = []
-    
-    i = 0
-    while i < len(words):
-        word = words[i]
-        
-        # Handle "DOUBLE U"
-        if word == 'DOUBLE' and i + 1 < len(words) and words[i+1] in ['U', 'YOU']:
-            recognized_letters.append('W')
-            i += 2; continue
-            
-        if word in letter_names:
-            recognized_letters.append(letter_names[word])
-        elif len(word) == 1 and word.isalpha():
-            recognized_letters.append(word)
-        elif word == 'SPACE':
-            recognized_letters.append(' ')
-        elif word.isalpha():
-            recognized_letters.append(word[0])
-            
-        i += 1
-    return recognized_letters
+    return parse_letters(spoken_text.upper().split())
 
-def recognize_speech_unified(target_word, mode="spelling", slow_speed=False):
+ASR_ENGINE = os.getenv("DYSLEXIA_ASR_ENGINE", "auto")  # auto | vosk | google
+
+def recognize_speech_unified(target_word, mode="spelling", slow_speed=False,
+                             session_id=None, device_index=None):
     """
     Unified function for both Spelling and Pronunciation.
+    The noise floor is measured once per (session_id, device_index) and reused.
     """
     if not target_word: return None
     
@@ -100,34 +51,24 @@ def recognize_speech_unified(target_word, mode="spelling", slow_speed=False):
     target_upper = target_word.upper().strip()
     
     recognizer = sr.Recognizer()
+    use_vosk = ASR_ENGINE == "vosk" or (ASR_ENGINE == "auto" and vosk_available())
     
+    st.markdown(WORD_STATE_CSS, unsafe_allow_html=True)
+
     def display_word_state(match_results, is_final=False):
-        html_parts = []
-        if is_final:
-            for i, letter in enumerate(target_upper):
-                is_correct = False
-                if i < len(match_results) and match_results[i] is True:
-                    is_correct = True
-                
-                color = "#38ef7d" if is_correct else "#ff4b5c"
-                display_char = letter if letter != ' ' else '&nbsp;&nbsp;'
-                html_parts.append(f'<span style="color:{color}; font-size:70px; font-weight:bold; text-shadow:2px 2px 6px rgba(0,0,0,0.2); margin: 0 5px;">{display_char}</span>')
-        else:
-            for letter in target_upper:
-                display_char = letter if letter != ' ' else '&nbsp;&nbsp;'
-                html_parts.append(f'<span style="color:#2E86AB; font-size:70px; font-weight:bold; margin: 0 5px;">{display_char}</span>')
-
-        word_html = f"""
-        <div style="text-align:center; margin:30px 0; background: rgba(255,255,255,0.1); 
-                    border-radius:20px; padding:25px; border:2px solid rgba(255,255,255,0.2);">
-            {''.join(html_parts)}
-        </div>"""
-        word_display_placeholder.markdown(word_html, unsafe_allow_html=True)
+        word_display_placeholder.markdown(
+            word_state_html(target_upper, match_results, is_final), unsafe_allow_html=True
+        )
 
     try:
-        with sr.Microphone() as source:
-            status_placeholder.warning("🤫 Adjusting for background noise...")
-            recognizer.adjust_for_ambient_noise(source, duration=1.0)
+        with sr.Microphone(device_index=device_index) as source:
+            stored_threshold = NOISE_PROFILES.threshold(session_id, device_index)
+            if stored_threshold is None:
+                status_placeholder.warning("🤫 Adjusting for background noise...")
+                recognizer.adjust_for_ambient_noise(source, duration=1.0)
+                NOISE_PROFILES.record(session_id, device_index, recognizer.energy_threshold)
+            else:
+                recognizer.energy_threshold = stored_threshold
             
             display_word_state([], is_final=False)
             
@@ -142,59 +83,60 @@ def recognize_speech_unified(target_word, mode="spelling", slow_speed=False):
             status_placeholder.success("🎤 **LISTENING... GO!**")
             
             try:
-                audio = recognizer.listen(source, timeout=8, phrase_time_limit=15 if mode == "spelling" else 5)
-                status_placeholder.info("🔄 **Processing...**")
-                
-                spoken_text = ""
-                try:
-                    spoken_text = recognizer.recognize_google(audio, language='en-US').upper()
+                match_letters = match_spelling if mode == "spelling" else match_pronunciation
+                max_seconds = 15 if mode == "spelling" else 5
+                # Ends capture as soon as the child stops, instead of fixed timeouts
+                vad = EnergyVAD.for_mode(
+                    mode, source.SAMPLE_RATE, energy_threshold=recognizer.energy_threshold
+                )
+
+                if use_vosk:
+                    # Stream chunks to the local model; letters turn green as they are spoken
+                    streamer = StreamingRecognizer(
+                        source.SAMPLE_RATE, grammar=SPELLING_GRAMMAR if mode == "spelling" else None
+                    )
+                    shown = []
+
+                    def on_partial(text):
+                        results = match_letters(target_upper, text)
+                        if results != shown:
+                            shown[:] = results
+                            display_word_state(results, is_final=False)
+
+                    spoken_text = stream_microphone(
+                        source, streamer, on_partial=on_partial, max_seconds=max_seconds,
+                        stop_when=lambda text: all(match_letters(target_upper, text)),
+                        vad=vad,
+                    )
+                    if not spoken_text:
+                        raise sr.WaitTimeoutError("No speech heard")
+                    transcripts = [spoken_text]
+                else:
+                    audio = listen_with_vad(source, vad, timeout=8, max_seconds=max_seconds)
+                    status_placeholder.info("🔄 **Processing...**")
+
+                    # Every alternative is re-scored; a lower-ranked one often spells better
+                    transcripts = []
+                    try:
+                        result = recognizer.recognize_google(audio, language='en-US', show_all=True)
+                        if isinstance(result, dict):
+                            transcripts = [alt['transcript'].upper() for alt in result.get('alternative', [])]
+                    except sr.UnknownValueError:
+                        transcripts = []
+
+                # Keep the stored noise floor current from this attempt's silent frames
+                NOISE_PROFILES.observe(session_id, device_index, vad.noise_rms)
+
+                spoken_text, match_results = choose_transcript(target_upper, transcripts, mode)
+                if spoken_text:
                     st.toast(f"Heard: {spoken_text}")
-                except sr.UnknownValueError:
-                    spoken_text = "" 
-                
+
                 feedback = {}
-                match_results = [False] * len(target_upper)
-                
-                if mode == "spelling":
-                    spoken_letters = extract_letters_from_speech(spoken_text, len(target_upper))
-                    spoken_idx = 0
-                    
-                    # --- FIXED LOGIC FOR SPACES ---
-                    for i, target_char in enumerate(target_upper):
-                        if target_char == ' ':
-                            # If user explicitly said "Space", consume it
-                            if spoken_idx < len(spoken_letters) and spoken_letters[spoken_idx] == ' ':
-                                match_results[i] = True
-                                spoken_idx += 1
-                            else:
-                                # User didn't say space? Auto-mark Correct! (Don't break flow)
-                                match_results[i] = True
-                        else:
-                            # Normal Letter Matching
-                            if spoken_idx < len(spoken_letters):
-                                if spoken_letters[spoken_idx] == ' ': # Skip accidental extra space in speech
-                                    spoken_idx += 1
-                                    
-                                if spoken_idx < len(spoken_letters):
-                                    sl = spoken_letters[spoken_idx]
-                                    if sl == target_char or phonetic_match(sl, target_char):
-                                        match_results[i] = True
-                                    spoken_idx += 1
-                        
-                        feedback[target_char] = "correct" if match_results[i] else "incorrect"
-
-                else: 
-                    # Pronunciation Mode
+                for i, letter in enumerate(target_upper):
+                    feedback[letter] = "correct" if match_results[i] else "incorrect"
+
+                if mode != "spelling":
                     spoken_clean = ''.join(c for c in spoken_text if c.isalnum())
-                    matcher = difflib.SequenceMatcher(None, target_upper, spoken_clean)
-                    for match_id, (i, j, n) in enumerate(matcher.get_matching_blocks()):
-                        for k in range(n):
-                            if i + k < len(match_results):
-                                match_results[i + k] = True
-
-                    for i, letter in enumerate(target_upper):
-                        feedback[letter] = "correct" if match_results[i] else "incorrect"
-                    
                     if not spoken_clean: st.warning("⚠️ Didn't catch that.")
                     elif not all(match_results): st.warning(f"👂 You said: **{spoken_text}**")
 
@@ -0,0 +1,62 @@
+// Client-side spelling animation: receives the word, one audio track and the
+// letter timing map once, then moves the highlight locally from audio.currentTime.
+(function () {
+  const data = JSON.parse(document.getElementById("spell-data").textContent);
+  const wordEl = document.getElementById("spell-word");
+  const finalEl = document.getElementById("spell-final");
+  const playBtn = document.getElementById("spell-play");
+
+  const letters = Array.from(data.word).map((char) => {
+    const span = document.createElement("span");
+    span.className = "letter";
+    span.textContent = char === " " ? " " : char;
+    wordEl.appendChild(span);
+    return span;
+  });
+
+  const audio = new Audio(data.audio);
+  let active = -1;
+  let finished = false;
+
+  function setActive(index) {
+    if (index === active) return;
+    if (active >= 0) letters[active].classList.remove("active");
+    if (index >= 0) letters[index].classList.add("active");
+    active = index;
+  }
+
+  function showFinal() {
+    if (finished) return;
+    finished = true;
+    setActive(-1);
+    wordEl.style.display = "none";
+    finalEl.style.display = "block";
+  }
+
+  function letterAt(ms) {
+    for (const t of data.timings) {
+      if (ms >= t.start_ms && ms < t.end_ms) return t.index;
+    }
+    return active;
+  }
+
+  function tick() {
+    const ms = audio.currentTime * 1000;
+    if (ms >= data.word_start_ms) {
+      showFinal();
+    } else {
+      setActive(letterAt(ms));
+    }
+    if (!audio.paused && !audio.ended) requestAnimationFrame(tick);
+  }
+
+  function start() {
+    playBtn.style.display = "none";
+    audio.play().catch(() => { playBtn.style.display = "inline-block"; });
+  }
+
+  audio.addEventListener("play", () => requestAnimationFrame(tick));
+  audio.addEventListener("ended", showFinal);
+  playBtn.addEventListener("click", start);
+  start();
+})();
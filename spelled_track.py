@@ -0,0 +1,288 @@
+import struct
+import threading
+from collections import OrderedDict
+
+from audio_backend import audio_mime
+from audio_cache import get_tts_cache
+from clip_bank import load_clip_bank, token_for_char
+from tts_engines import get_engine
+
+# ========================================
+# 🎼 SINGLE SPELLED-WORD TRACK + TIMING MAP
+# ========================================
+LETTER_GAP_MS = 200   # Pause after every letter
+SILENT_CHAR_MS = 300  # Spaces and punctuation are silent
+WORD_GAP_MS = 500     # Pause between the spelling and the whole word
+TRACK_CACHE_SIZE = 256
+
+_MP3_BITRATES_V1_L3 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+_MP3_BITRATES_V2_L3 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+
+_tracks = OrderedDict()  # (word, lang, slow_letters, slow_word, bank) -> SpelledTrack, LRU order
+_tracks_lock = threading.Lock()
+
+
+class SpelledTrack:
+    def __init__(self, word, audio, mime, timings, word_start_ms, duration_ms):
+        """
+        One audio track spelling a word and then saying it.
+        :param audio: Encoded track bytes
+        :param mime: "audio/mpeg" or "audio/wav"
+        :param timings: One dict per character of the word:
+                        {"index", "char", "start_ms", "end_ms"}
+        :param word_start_ms: Where the whole-word clip starts in the track
+        :param duration_ms: Total length of the track
+        """
+        self.word = word
+        self.audio = audio
+        self.mime = mime
+        self.timings = timings
+        self.word_start_ms = word_start_ms
+        self.duration_ms = duration_ms
+
+    def to_payload(self):
+        """JSON-ready timing map (audio is sent separately)."""
+        return {
+            "word": self.word,
+            "mime": self.mime,
+            "timings": self.timings,
+            "word_start_ms": self.word_start_ms,
+            "duration_ms": self.duration_ms,
+        }
+
+
+# --- MP3: concatenate raw MPEG frames -----------------------------------
+
+def _skip_id3(data):
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        return 10 + size
+    return 0
+
+
+def mp3_frames(data):
+    """Yield (offset, length, samples, sample_rate) for each Layer III frame."""
+    pos = _skip_id3(data)
+    while pos + 4 <= len(data):
+        b1, b2 = data[pos + 1], data[pos + 2]
+        if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+            break  # Trailing tag or garbage
+        version = (b1 >> 3) & 0x03
+        layer = (b1 >> 1) & 0x03
+        bitrate_index = b2 >> 4
+        rate_index = (b2 >> 2) & 0x03
+        if layer != 1 or version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+            raise ValueError("Unsupported MPEG audio frame")
+
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+        padding = (b2 >> 1) & 0x01
+        if version == 3:
+            bitrate = _MP3_BITRATES_V1_L3[bitrate_index] * 1000
+            samples, coefficient = 1152, 144
+        else:
+            bitrate = _MP3_BITRATES_V2_L3[bitrate_index] * 1000
+            samples, coefficient = 576, 72
+        length = coefficient * bitrate // sample_rate + padding
+        yield pos, length, samples, sample_rate
+        pos += length
+
+
+def _is_info_frame(frame):
+    """Xing/Info (LAME) or VBRI header frame: metadata about one clip, not audio."""
+    return b"Xing" in frame[4:48] or b"Info" in frame[4:48] or frame[36:40] == b"VBRI"
+
+
+def _audio_frames(data):
+    """mp3_frames() without the clip's Xing/Info/VBRI header frame."""
+    for pos, length, samples, sample_rate in mp3_frames(data):
+        if not _is_info_frame(data[pos:pos + length]):
+            yield pos, length, samples, sample_rate
+
+
+def _mp3_silence_frame(header, sample_rate):
+    """A frame with the clip's header and all-zero side info decodes as silence."""
+    header = bytearray(header)
+    header[1] |= 0x01  # No CRC
+    header[2] &= 0xFD  # No padding
+    version = (header[1] >> 3) & 0x03
+    if version == 3:
+        bitrate, coefficient = _MP3_BITRATES_V1_L3[header[2] >> 4], 144
+    else:
+        bitrate, coefficient = _MP3_BITRATES_V2_L3[header[2] >> 4], 72
+    length = coefficient * bitrate * 1000 // sample_rate
+    return bytes(header) + bytes(length - 4)
+
+
+def _concat_mp3(segments):
+    # Silence frames are cloned from the first real frame so the stream stays uniform
+    first_clip = next(value for kind, value in segments if kind == "clip")
+    pos, _, samples, sample_rate = next(_audio_frames(first_clip))
+    silent_frame = _mp3_silence_frame(first_clip[pos:pos + 4], sample_rate)
+    frame_ms = samples * 1000 / sample_rate
+
+    out = bytearray()
+    ms = 0.0
+    spans = []
+    for kind, value in segments:
+        start = ms
+        if kind == "clip":
+            # Per-clip Xing/Info frames are dropped: mid-stream they make decoders
+            # report one clip's duration and seek wrongly across the whole track
+            for pos, length, samples, sample_rate in _audio_frames(value):
+                out += value[pos:pos + length]
+                ms += samples * 1000 / sample_rate
+        else:
+            for _ in range(max(1, round(value / frame_ms))):
+                out += silent_frame
+                ms += frame_ms
+        spans.append((start, ms))
+    return bytes(out), spans
+
+
+# --- WAV: concatenate PCM ------------------------------------------------
+
+def _wav_parts(data):
+    """Return (fmt chunk bytes, pcm bytes) of a RIFF/WAVE clip."""
+    pos = 12
+    fmt = pcm = None
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        body = data[pos + 8:pos + 8 + size]  # Streamed wavs may overstate the size
+        if chunk_id == b"fmt ":
+            fmt = body
+        elif chunk_id == b"data":
+            pcm = body
+        pos += 8 + size + (size & 1)
+    if fmt is None or pcm is None:
+        raise ValueError("Malformed WAV clip")
+    return fmt, pcm
+
+
+def clip_duration_ms(data):
+    """Playing time of one MP3 or WAV clip, read from its frames/header."""
+    if audio_mime(data) == "audio/wav":
+        fmt, pcm = _wav_parts(data)
+        return len(pcm) * 1000 / struct.unpack("<I", fmt[8:12])[0]
+    return sum(samples * 1000 / sample_rate for _, _, samples, sample_rate in _audio_frames(data))
+
+
+def _concat_wav(segments):
+    fmt = None
+    pcm = bytearray()
+    spans = []
+    byte_rate = block_align = None
+    ms = 0.0
+    pending_silence = []
+    for kind, value in segments:
+        start = ms
+        if kind == "clip":
+            clip_fmt, clip_pcm = _wav_parts(value)
+            if fmt is None:
+                fmt = clip_fmt
+                byte_rate = struct.unpack("<I", fmt[8:12])[0]
+                block_align = struct.unpack("<H", fmt[12:14])[0]
+                for silent_ms in pending_silence:
+                    pcm += bytes(int(byte_rate * silent_ms / 1000) // block_align * block_align)
+            elif clip_fmt[:16] != fmt[:16]:
+                raise ValueError("WAV clips have different formats")
+            pcm += clip_pcm
+            ms += len(clip_pcm) * 1000 / byte_rate
+        else:
+            if fmt is None:
+                pending_silence.append(value)
+            else:
+                pcm += bytes(int(byte_rate * value / 1000) // block_align * block_align)
+            ms += value
+        spans.append((start, ms))
+    if fmt is None:
+        raise ValueError("Track has no audio clips")
+    header = b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(pcm)) + b"WAVE"
+    header += b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    header += b"data" + struct.pack("<I", len(pcm))
+    return header + bytes(pcm), spans
+
+
+# --- Track assembly ------------------------------------------------------
+
+def build_spelled_track(word, lang='en', slow_letters=True, slow_word=False):
+    """
+    Build one track: each letter clip, a gap, ..., then the whole word.
+    Letter clips come from the clip bank (or the TTS cache if it is not built).
+    Tracks are reused while the clip bank is unchanged; a track holding a
+    fallback engine's clip is never reused, so it is rebuilt once the voice recovers.
+    """
+    # "Cat" and " cat " are the same track
+    word = " ".join(word.split()).lower()
+    slow_letters, slow_word = bool(slow_letters), bool(slow_word)
+    bank = load_clip_bank(lang, slow_letters)  # Same object until its manifest changes
+    key = (word, lang, slow_letters, slow_word, bank)
+    with _tracks_lock:
+        track = _tracks.get(key)
+        if track is not None:
+            _tracks.move_to_end(key)
+            return track
+
+    track, preferred_voice = _build_spelled_track(word, lang, slow_letters, slow_word, bank)
+    if preferred_voice:
+        with _tracks_lock:
+            _tracks[key] = track
+            while len(_tracks) > TRACK_CACHE_SIZE:
+                _tracks.popitem(last=False)
+    return track
+
+
+def _build_spelled_track(word, lang, slow_letters, slow_word, bank):
+    """(SpelledTrack, True if every synthesized clip is in the engine's preferred voice)."""
+    cache = get_tts_cache()
+    engine = get_engine()
+    preferred = engine.names()[0]
+    voices = set()
+    word_upper = word.upper()
+
+    def synthesize(text, slow):
+        data, name = cache.get_or_render(text, lang, slow, engine)
+        voices.add(name)
+        return data
+
+    segments = []
+    for char in word_upper:
+        token = token_for_char(char)
+        if char == ' ' or token is None:
+            segments.append(("silence", SILENT_CHAR_MS))
+            continue
+        # Bank clips are always in the preferred voice (build_clip_bank refuses fallbacks)
+        clip = bank.data(token) if bank is not None else synthesize(token, slow_letters)
+        segments.append(("clip", clip))
+        segments.append(("silence", LETTER_GAP_MS))
+    segments.append(("silence", WORD_GAP_MS))
+    segments.append(("clip", synthesize(word, slow_word)))
+
+    mimes = {audio_mime(value) for kind, value in segments if kind == "clip"}
+    if len(mimes) != 1:
+        raise ValueError("Letter and word clips come from engines with different formats")
+    mime = mimes.pop()
+    audio, spans = (_concat_wav if mime == "audio/wav" else _concat_mp3)(segments)
+
+    # Each character spans its clip plus the gap after it
+    timings = []
+    seg = 0
+    for index, char in enumerate(word_upper):
+        start = spans[seg][0]
+        token = token_for_char(char)
+        seg += 1 if (char == ' ' or token is None) else 2
+        timings.append({
+            "index": index,
+            "char": char,
+            "start_ms": int(round(start)),
+            "end_ms": int(round(spans[seg - 1][1])),
+        })
+    word_start_ms = int(round(spans[-1][0]))
+    track = SpelledTrack(word_upper, audio, mime, timings, word_start_ms, int(round(spans[-1][1])))
+    return track, voices <= {preferred}
@@ -0,0 +1,126 @@
+import numpy as np
+
+# ========================================
+# 🧮 OPTIMAL-ALIGNMENT SPELLING SCORER
+# ========================================
+# Letters whose spoken names are easily confused (by children and recognizers).
+# Substituting within a group is cheaper, which steers the alignment towards
+# "said D instead of B" rather than "dropped B, inserted D".
+CONFUSION_GROUPS = [
+    "BCDEGPTVZ",  # ...EE rhymes
+    "AJK",        # ...AY rhymes
+    "FLMNSX",     # E... names
+    "IY",
+    "QUW",
+]
+INSERT_COST = 1.0
+DELETE_COST = 1.0
+SUBSTITUTE_COST = 1.0
+CONFUSABLE_COST = 0.6
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+_CODE = {c: i for i, c in enumerate(ALPHABET)}
+_UNKNOWN = len(ALPHABET)  # Any other symbol
+_PAD = _UNKNOWN + 1       # Padding past the end of a shorter hypothesis
+
+
+def _build_cost_table():
+    size = _PAD + 1
+    table = np.full((size, size), SUBSTITUTE_COST, dtype=np.float32)
+    for group in CONFUSION_GROUPS:
+        codes = [_CODE[c] for c in group]
+        table[np.ix_(codes, codes)] = CONFUSABLE_COST
+    np.fill_diagonal(table, 0.0)
+    table[_UNKNOWN, _UNKNOWN] = SUBSTITUTE_COST  # Two unknowns are not a match
+    table[:, _PAD] = SUBSTITUTE_COST
+    return table
+
+
+SUBSTITUTION_COSTS = _build_cost_table()
+
+
+def _encode(letters):
+    return np.array([_CODE.get(c, _UNKNOWN) for c in letters], dtype=np.int64)
+
+
+def _alignment_tables(target, hypotheses):
+    """
+    Edit-distance DP for all hypotheses at once.
+    Returns (D, sub, lengths): D has shape (N, T+1, L+1).
+    Each row is computed with whole-array operations; the insertion chain along
+    a row is resolved with a running minimum, so there is no per-cell Python loop.
+    """
+    n = len(hypotheses)
+    t = len(target)
+    lengths = np.array([len(h) for h in hypotheses], dtype=np.int64)
+    width = int(lengths.max()) if n else 0
+
+    hyp_codes = np.full((n, width), _PAD, dtype=np.int64)
+    for k, hyp in enumerate(hypotheses):
+        hyp_codes[k, :len(hyp)] = _encode(hyp)
+    target_codes = _encode(target)
+
+    sub = SUBSTITUTION_COSTS[target_codes[None, :, None], hyp_codes[:, None, :]]  # (N, T, L)
+    ramp = np.arange(width + 1, dtype=np.float32) * INSERT_COST
+
+    D = np.empty((n, t + 1, width + 1), dtype=np.float32)
+    D[:, 0, :] = ramp
+    for i in range(1, t + 1):
+        base = np.empty((n, width + 1), dtype=np.float32)
+        base[:, 0] = D[:, i - 1, 0] + DELETE_COST
+        base[:, 1:] = np.minimum(
+            D[:, i - 1, :-1] + sub[:, i - 1, :],   # match / substitute
+            D[:, i - 1, 1:] + DELETE_COST,         # target letter missing from speech
+        )
+        # D[i, j] = min_k (base[i, k] + (j - k) * INSERT_COST)
+        D[:, i, :] = np.minimum.accumulate(base - ramp, axis=1) + ramp
+    return D, sub, lengths
+
+
+def _backtrace(D, sub, target, hyp, k):
+    """Per-target-letter correctness along the optimal path of hypothesis k."""
+    matched = [False] * len(target)
+    i, j = len(target), len(hyp)
+    while i > 0 or j > 0:
+        here = D[k, i, j]
+        if i > 0 and j > 0 and np.isclose(here, D[k, i - 1, j - 1] + sub[k, i - 1, j - 1]):
+            matched[i - 1] = target[i - 1] == hyp[j - 1]
+            i, j = i - 1, j - 1
+        elif i > 0 and np.isclose(here, D[k, i - 1, j] + DELETE_COST):
+            i -= 1
+        else:
+            j -= 1
+    return matched
+
+
+def score_hypotheses(target, hypotheses):
+    """
+    Align every hypothesis (a list of spoken letters) to the target letters.
+    :param target: Target letters, spaces removed
+    :param hypotheses: List of letter lists, best recognizer guess first
+    :return: (best index, per-letter match list, costs array)
+    """
+    if not hypotheses:
+        return 0, [False] * len(target), np.zeros(0, dtype=np.float32)
+    D, sub, lengths = _alignment_tables(target, hypotheses)
+    costs = D[np.arange(len(hypotheses)), len(target), lengths]
+    best = int(np.argmin(costs))  # Ties keep the recognizer's own ranking
+    return best, _backtrace(D, sub, target, hypotheses[best], best), costs
+
+
+def score_spelling(target_upper, hypotheses):
+    """
+    Per-letter results for a spelled word, choosing the best of N hypotheses.
+    Spaces in the target are always correct; spoken "SPACE" tokens are ignored.
+    :param hypotheses: List of letter lists as produced by parse_letters
+    :return: (best index, match_results aligned with target_upper)
+    """
+    letters = [c for c in target_upper if c != ' ']
+    cleaned = [[c for c in hyp if c != ' '] for hyp in hypotheses]
+    best, matched, _ = score_hypotheses(letters, cleaned)
+
+    match_results = []
+    it = iter(matched)
+    for c in target_upper:
+        match_results.append(True if c == ' ' else next(it))
+    return best, match_results
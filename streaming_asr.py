@@ -0,0 +1,105 @@
+import json
+import os
+import time
+from functools import lru_cache
+
+# ========================================
+# 🎧 STREAMING OFFLINE SPEECH RECOGNITION (VOSK)
+# ========================================
+VOSK_MODEL_PATH = os.getenv(
+    "VOSK_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "vosk-model-small-en-us-0.15"),
+)
+CHUNK_FRAMES = 4000  # 250 ms at 16 kHz
+
+
+def vosk_available(model_path=VOSK_MODEL_PATH):
+    try:
+        import vosk  # noqa: F401
+    except ImportError:
+        return False
+    return os.path.isdir(model_path)
+
+
+@lru_cache(maxsize=2)
+def load_vosk_model(model_path=VOSK_MODEL_PATH):
+    """Load the acoustic model once per process (it takes seconds)."""
+    from vosk import Model, SetLogLevel
+    SetLogLevel(-1)
+    return Model(model_path)
+
+
+class StreamingRecognizer:
+    def __init__(self, sample_rate, grammar=None, model_path=VOSK_MODEL_PATH):
+        """
+        Incremental recognizer fed with raw 16-bit mono PCM chunks.
+        :param sample_rate: Rate of the PCM being fed
+        :param grammar: Optional list of phrases to restrict decoding to
+                        (e.g. letter names in spelling mode)
+        """
+        from vosk import KaldiRecognizer
+        model = load_vosk_model(model_path)
+        if grammar:
+            self._recognizer = KaldiRecognizer(model, sample_rate, json.dumps(grammar + ["[unk]"]))
+        else:
+            self._recognizer = KaldiRecognizer(model, sample_rate)
+        self._segments = []
+
+    def _committed(self):
+        return " ".join(s for s in self._segments if s)
+
+    def feed(self, chunk):
+        """Feed audio and return the best hypothesis for everything heard so far."""
+        if self._recognizer.AcceptWaveform(chunk):
+            # Vosk closed a segment at a pause; keep it and start a new one
+            text = json.loads(self._recognizer.Result()).get("text", "")
+            self._segments.append(text.replace("[unk]", "").strip())
+            return self._committed()
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        partial = partial.replace("[unk]", "").strip()
+        return " ".join(s for s in (self._committed(), partial) if s)
+
+    def finish(self):
+        """Flush the decoder and return the final transcript."""
+        text = json.loads(self._recognizer.FinalResult()).get("text", "")
+        self._segments.append(text.replace("[unk]", "").strip())
+        return self._committed()
+
+
+def stream_microphone(source, recognizer, on_partial=None, max_seconds=15.0,
+                      silence_seconds=2.5, stop_when=None, vad=None):
+    """
+    Read an open sr.Microphone and feed the recognizer chunk by chunk.
+    :param on_partial: on_partial(text) whenever the hypothesis changes
+    :param max_seconds: Hard cap on capture length
+    :param silence_seconds: Stop once the hypothesis has not changed for this long
+                            after something was heard
+    :param stop_when: stop_when(text) -> bool, e.g. "every letter matched"
+    :param vad: Optional EnergyVAD; when given it decides the endpoint instead
+                of `silence_seconds`
+    :return: Final transcript (uppercase)
+    """
+    chunk_frames = min(CHUNK_FRAMES, source.SAMPLE_RATE // 4)
+    started = time.monotonic()
+    last_text = ""
+    last_change = started
+
+    while time.monotonic() - started < max_seconds:
+        chunk = source.stream.read(chunk_frames)
+        if not chunk:
+            break
+        text = recognizer.feed(chunk).upper()
+        ended = vad.process(chunk) if vad is not None else False
+        now = time.monotonic()
+        if text != last_text:
+            last_text, last_change = text, now
+            if on_partial is not None:
+                on_partial(text)
+            if stop_when is not None and stop_when(text):
+                break
+        if ended:
+            break
+        if vad is None and last_text and now - last_change >= silence_seconds:
+            break
+
+    return recognizer.finish().upper()
@@ -0,0 +1,122 @@
+"""
+GeminiClient against a local http.server stub (no network, no API key).
+
+    python -m unittest test_gemini_client
+"""
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gemini_client import CircuitBreaker, CircuitOpenError, GeminiClient, GeminiError, text_part
+
+REPLY = {"candidates": [{"content": {"parts": [{"text": "Apple"}]}}]}
+
+
+class StubGemini:
+    """Answers :generateContent with queued statuses (200 once the queue is empty)."""
+
+    def __init__(self):
+        self.statuses = []
+        self.requests = 0
+        self.hold = None  # threading.Event the next request waits on, if set
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.requests += 1
+                hold, stub.hold = stub.hold, None
+                if hold is not None:
+                    hold.wait(5)
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                body = json.dumps(REPLY if status == 200 else {"error": "busy"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1beta"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class GeminiClientTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubGemini()
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0, clock=self.clock)
+
+    def tearDown(self):
+        self.stub.close()
+
+    def client(self, max_retries=3):
+        return GeminiClient("test-key", base_url=self.stub.base_url, max_retries=max_retries,
+                            backoff_base=0.01, backoff_max=0.05, breaker=self.breaker)
+
+    def test_retries_503_then_succeeds(self):
+        self.stub.statuses = [503]
+        self.assertEqual(self.client().generate_text([text_part("hi")], deadline=5), "Apple")
+        self.assertEqual(self.stub.requests, 2)
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_failures_open_the_breaker(self):
+        client = self.client(max_retries=0)
+        self.stub.statuses = [503] * 3
+        for _ in range(3):
+            with self.assertRaises(GeminiError):
+                client.generate_text([text_part("hi")], deadline=5)
+        self.assertEqual(self.breaker.state, "open")
+
+        with self.assertRaises(CircuitOpenError):
+            client.generate_text([text_part("hi")], deadline=5)
+        self.assertEqual(self.stub.requests, 3)  # Refused without touching the server
+
+    def test_half_open_lets_one_trial_through(self):
+        client = self.client(max_retries=0)
+        self.stub.statuses = [503] * 3
+        for _ in range(3):
+            with self.assertRaises(GeminiError):
+                client.generate_text([text_part("hi")], deadline=5)
+        self.clock.now += 31
+        self.assertEqual(self.breaker.state, "half-open")
+
+        # The trial call is held on the server while a second call arrives
+        release = threading.Event()
+        self.stub.hold = release
+        trial = {}
+        worker = threading.Thread(
+            target=lambda: trial.setdefault("text", client.generate_text([text_part("hi")], deadline=5))
+        )
+        worker.start()
+        while self.stub.requests < 4:
+            time.sleep(0.01)
+        with self.assertRaises(CircuitOpenError):
+            client.generate_text([text_part("hi")], deadline=5)
+        release.set()
+        worker.join(5)
+
+        self.assertEqual(trial.get("text"), "Apple")
+        self.assertEqual(self.stub.requests, 4)
+        self.assertEqual(self.breaker.state, "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
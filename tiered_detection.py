@@ -0,0 +1,102 @@
+import hashlib
+import os
+import time
+
+from detection_cache import DETECTION_CACHE, dhash
+from gemini_client import get_client, image_part, text_part
+from gemini_gateway import get_gateway
+from image_prep import decode_reduced, prepare_jpeg
+from local_classifier import INPUT_SIZE, get_local_classifier
+
+# ========================================
+# 🪜 TIERED OBJECT DETECTION
+# ========================================
+# 1. perceptual-hash cache  2. local CPU classifier  3. Gemini
+LOCAL_CONFIDENCE = float(os.getenv("DYSLEXIA_LOCAL_CONFIDENCE", "0.6"))
+DETECTION_PROMPT = ("Look at this image carefully. Identify the main object that a person is showing or holding. "
+                    "Return only the single most prominent object name in English (e.g. 'Apple', 'Book'). "
+                    "Be specific and concise.")
+
+
+class DetectionResult:
+    def __init__(self, label, tier, elapsed_ms, confidence=None):
+        """
+        :param label: Detected object name, or None
+        :param tier: "cache", "local" or "gemini" (whichever answered), or "none" if
+                     the local tier was unsure and Gemini was not available to ask
+        :param elapsed_ms: Wall time of the whole lookup
+        :param confidence: Local classifier probability, when it was consulted
+        """
+        self.label = label
+        self.tier = tier
+        self.elapsed_ms = elapsed_ms
+        self.confidence = confidence
+
+
+def detect_tiered(frame, remote, threshold=LOCAL_CONFIDENCE, classifier=None, cache=DETECTION_CACHE):
+    """
+    Answer from the cheapest tier that is confident enough.
+    :param frame: Decoded BGR frame (a reduced-scale decode is fine)
+    :param remote: Zero-argument callable asking Gemini; only called as a last resort
+                   (None: no remote tier, e.g. no API key)
+    :param threshold: Minimum local confidence to skip Gemini
+    :param classifier: Defaults to the process-wide local classifier, if installed
+    """
+    start = time.perf_counter()
+
+    def done(label, tier, confidence=None):
+        return DetectionResult(label, tier, (time.perf_counter() - start) * 1000, confidence)
+
+    frame_hash = dhash(frame)
+    cached = cache.get(frame_hash)
+    if cached:
+        return done(cached, "cache")
+
+    classifier = classifier or get_local_classifier()
+    confidence = None
+    if classifier is not None:
+        label, confidence = classifier.classify(frame)
+        if confidence >= threshold:
+            cache.put(frame_hash, label)
+            return done(label, "local", confidence)
+
+    if remote is None:
+        return done(None, "none", confidence)
+    label = remote()
+    if label:
+        cache.put(frame_hash, label)
+    return done(label, "gemini", confidence)
+
+
+def clean_label(text):
+    """Strip the chatty lead-ins and trailing sentence from a model answer."""
+    detected_text = text.strip()
+    prefixes = ["The object is", "I can see", "This is", "Object:"]
+    for p in prefixes:
+        if detected_text.lower().startswith(p.lower()):
+            detected_text = detected_text[len(p):].strip()
+    return detected_text.split('.')[0].strip() or None
+
+
+def ask_gemini(image_bytes, api_key, session_id=None):
+    """Object name for a camera JPEG from Gemini, via the shared gateway."""
+    # Camera JPEG is sent as-is when already model-sized, else decoded at reduced scale
+    prepared = prepare_jpeg(image_bytes)
+    parts = [text_part(DETECTION_PROMPT), image_part(prepared.jpeg)]
+    # Simultaneous requests for the same photo share one upstream call
+    text = get_gateway().call(
+        ("detect", hashlib.sha1(image_bytes).hexdigest()),
+        lambda: get_client(api_key).generate_text(parts, deadline=20),
+        session_id=session_id,
+    )
+    return clean_label(text) if text else None
+
+
+def detect_image(image_bytes, api_key=None, session_id=None):
+    """
+    Tiered detection for a camera JPEG.
+    :param api_key: Gemini key; without one only the cache and local tiers are tried
+    """
+    frame = decode_reduced(image_bytes, INPUT_SIZE)
+    remote = (lambda: ask_gemini(image_bytes, api_key, session_id)) if api_key else None
+    return detect_tiered(frame, remote)
@@ -0,0 +1,190 @@
+import io
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+# ========================================
+# 🗣️ PLUGGABLE TTS ENGINES
+# ========================================
+# "auto" prefers gTTS and falls back to a local engine when it is slow or down,
+# "local" never touches the network, "gtts" always uses Google.
+ENGINE_MODE = os.getenv("DYSLEXIA_TTS_ENGINE", "auto")
+REMOTE_LATENCY_BUDGET_MS = float(os.getenv("DYSLEXIA_TTS_LATENCY_BUDGET_MS", "800"))
+REMOTE_PROBE_INTERVAL = 30.0
+
+
+class TTSEngine:
+    """Interface every speech engine implements."""
+    name = "base"
+    is_local = False
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, lang='en', slow=False):
+        """Return encoded audio bytes (mp3 or wav) for the text."""
+        raise NotImplementedError
+
+    def render(self, text, lang='en', slow=False):
+        """Return (audio bytes, name of the engine that produced them)."""
+        return self.synthesize(text, lang, slow), self.name
+
+    def names(self):
+        """Engine names whose clips this engine may return, in preference order."""
+        return [self.name]
+
+
+class GTTSEngine(TTSEngine):
+    name = "gtts"
+
+    def __init__(self, timeout=None):
+        """
+        Google Translate TTS (network).
+        :param timeout: Seconds to wait for the server before giving up
+        """
+        self.timeout = timeout
+
+    def synthesize(self, text, lang='en', slow=False):
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=slow, timeout=self.timeout).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakEngine(TTSEngine):
+    name = "espeak"
+    is_local = True
+
+    def __init__(self, words_per_minute=160, slow_words_per_minute=110):
+        """
+        Fully offline synthesis through the espeak-ng / espeak binary.
+        :param words_per_minute: Normal speaking rate
+        :param slow_words_per_minute: Rate used when slow=True
+        """
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.words_per_minute = words_per_minute
+        self.slow_words_per_minute = slow_words_per_minute
+
+    def available(self):
+        return self.binary is not None
+
+    def synthesize(self, text, lang='en', slow=False):
+        rate = self.slow_words_per_minute if slow else self.words_per_minute
+        result = subprocess.run(
+            [self.binary, "-v", lang, "-s", str(rate), "--stdout", "--", text],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        return result.stdout  # WAV
+
+
+class LatencyFallbackEngine(TTSEngine):
+    name = "auto"
+
+    def __init__(self, remote, local, latency_budget_ms=REMOTE_LATENCY_BUDGET_MS,
+                 probe_interval=REMOTE_PROBE_INTERVAL):
+        """
+        Uses the remote engine while it is fast, the local one otherwise.
+        :param remote: Preferred (network) engine
+        :param local: Offline engine used when the remote is slow or unreachable
+        :param latency_budget_ms: Smoothed remote latency above which we switch
+        :param probe_interval: Seconds before a background probe retries the remote
+        """
+        self.remote = remote
+        self.local = local
+        self.latency_budget_ms = latency_budget_ms
+        self.probe_interval = probe_interval
+        self.remote_latency_ms = None  # EWMA
+        self._degraded_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def names(self):
+        # Local clips only stand in during an outage; once the remote is back,
+        # a miss re-renders with it instead of serving the fallback voice forever
+        if self.remote_healthy():
+            return [self.remote.name]
+        return [self.remote.name, self.local.name]
+
+    def _record(self, elapsed_ms, ok):
+        with self._lock:
+            if ok:
+                if self.remote_latency_ms is None:
+                    self.remote_latency_ms = elapsed_ms
+                else:
+                    self.remote_latency_ms = 0.7 * self.remote_latency_ms + 0.3 * elapsed_ms
+            if not ok or self.remote_latency_ms > self.latency_budget_ms:
+                self._degraded_until = time.monotonic() + self.probe_interval
+
+    def _remote_render(self, text, lang, slow):
+        start = time.perf_counter()
+        try:
+            data = self.remote.synthesize(text, lang, slow)
+        except Exception:
+            self._record(0.0, ok=False)
+            raise
+        self._record((time.perf_counter() - start) * 1000, ok=True)
+        return data
+
+    def _probe(self, lang):
+        try:
+            self._remote_render("A", lang, False)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._probing = False
+
+    def remote_healthy(self):
+        with self._lock:
+            return time.monotonic() >= self._degraded_until
+
+    def render(self, text, lang='en', slow=False):
+        if self.remote_healthy():
+            try:
+                return self._remote_render(text, lang, slow), self.remote.name
+            except Exception as e:
+                print(f"⚠️ {self.remote.name} failed ({e}); using {self.local.name}")
+                return self.local.synthesize(text, lang, slow), self.local.name
+
+        # Degraded: answer locally and let a background probe decide when to switch back
+        with self._lock:
+            start_probe = not self._probing and time.monotonic() >= self._degraded_until - self.probe_interval / 2
+            if start_probe:
+                self._probing = True
+        if start_probe:
+            threading.Thread(target=self._probe, args=(lang,), daemon=True).start()
+        return self.local.synthesize(text, lang, slow), self.local.name
+
+    def synthesize(self, text, lang='en', slow=False):
+        return self.render(text, lang, slow)[0]
+
+
+def build_engine(mode=ENGINE_MODE):
+    """Build the engine selected by DYSLEXIA_TTS_ENGINE."""
+    local = EspeakEngine()
+    if mode == "local":
+        if not local.available():
+            raise RuntimeError("DYSLEXIA_TTS_ENGINE=local but espeak/espeak-ng is not installed")
+        return local
+    if mode == "gtts" or not local.available():
+        return GTTSEngine()
+    budget_s = REMOTE_LATENCY_BUDGET_MS / 1000
+    return LatencyFallbackEngine(GTTSEngine(timeout=max(1.0, 3 * budget_s)), local)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Process-wide TTS engine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = build_engine()
+    return _engine
@@ -1,21 +1,37 @@
-from gtts import gTTS
-import os
-from playsound import playsound
-import tempfile
 import time
 
+from audio_backend import play_bytes
+from audio_cache import get_tts_cache
+from audio_delivery import deliver_clip, plays_in_browser
+from dedupe import ExpiringLRU
+from tts_engines import get_engine
+from clip_bank import load_clip_bank, token_for_char
+from spelled_track import build_spelled_track
+
+# Shared across instances so memory stays capped in a long-running server
+RECENT_WORDS = ExpiringLRU(maxsize=4096, ttl=3.0)
+
 class DyslexiaTTS:
-    def __init__(self, lang='en', slow_letters=True, slow_word=False):
+    def __init__(self, lang='en', slow_letters=True, slow_word=False, engine=None,
+                 session_id=None, spoken_words=None):
         """
         Initialize TTS settings.
         :param lang: Language code (default 'en' for English)
         :param slow_letters: Speak letters slowly for clarity
         :param slow_word: Speak word slowly or normally
+        :param engine: TTSEngine to synthesize with (default: process-wide engine)
+        :param session_id: Scope for repeat suppression (one per student session)
+        :param spoken_words: ExpiringLRU of recent (session, word) pairs (default: shared)
         """
         self.lang = lang
         self.slow_letters = slow_letters
         self.slow_word = slow_word
-        self.spoken_words = set()  # To avoid repetition
+        self.engine = engine or get_engine()
+        self.session_id = session_id
+        self.spoken_words = spoken_words if spoken_words is not None else RECENT_WORDS  # To avoid rapid repeats
+        self.letter_bank = load_clip_bank(lang, slow_letters)
+        if self.letter_bank is None:
+            print("⚠️ Clip bank not built; run `python clip_bank.py` for offline spelling.")
 
     def speak_text(self, word):
         """
@@ -24,53 +40,46 @@ class DyslexiaTTS:
         Speaks letter-by-letter AND spaces, then the whole word/phrase.
         """
         word = word.strip()
-        if not word or word.lower() in self.spoken_words:
+        if not word or self.spoken_words.check_and_add((self.session_id, word.lower())):
             return
 
         print(f"🔤 Speaking: {word}")
-        self.spoken_words.add(word.lower())
-
-        # Create temporary files for audio
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f_letters, \
-             tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f_word:
 
+        if plays_in_browser():
+            # One spelled-then-spoken track, handed to the browser; nothing plays here
             try:
-                # 1️⃣ Spell character by character INCLUDING spaces
-                # Build a list of what to say for each character
-                chars_to_speak = []
-                for char in word.upper():
-                    if char == ' ':
-                        chars_to_speak.append('SPACE')
-                    elif char.isalnum():
-                        chars_to_speak.append(char)
-                    # Ignore other special characters
-                
+                deliver_clip(build_spelled_track(word, self.lang, self.slow_letters, self.slow_word).audio)
+            except Exception as e:
+                print(f"❌ TTS Error: {e}")
+            return
+
+        cache = get_tts_cache()
+
+        try:
+            # 1️⃣ Spell character by character INCLUDING spaces
+            # Build a list of what to say for each character
+            chars_to_speak = []
+            for char in word.upper():
+                token = token_for_char(char)
+                if token:
+                    chars_to_speak.append(token)
+                # Ignore other special characters
+
+            print(f"  Characters: {' '.join(chars_to_speak)}")
+
+            if self.letter_bank is not None:
+                for token in chars_to_speak:
+                    play_bytes(self.letter_bank.data(token))
+            else:
                 chars_spaced = " ".join(chars_to_speak)
-                
-                print(f"  Characters: {chars_spaced}")
-                
-                tts_letters = gTTS(text=chars_spaced, lang=self.lang, slow=self.slow_letters)
-                tts_letters.save(f_letters.name)
-                playsound(f_letters.name)
+                play_bytes(cache.get_or_synthesize(chars_spaced, lang=self.lang, slow=self.slow_letters, engine=self.engine))
 
-                time.sleep(0.5)  # Pause between spelling and full word
+            time.sleep(0.5)  # Pause between spelling and full word
 
-                # 2️⃣ Speak full word/phrase exactly as it is
-                print(f"  Full word/phrase: {word}")
-                
-                tts_word = gTTS(text=word, lang=self.lang, slow=self.slow_word)
-                tts_word.save(f_word.name)
-                playsound(f_word.name)
+            # 2️⃣ Speak full word/phrase exactly as it is
+            print(f"  Full word/phrase: {word}")
 
-            except Exception as e:
-                print(f"❌ TTS Error: {e}")
-            finally:
-                # Cleanup temp files
-                try:
-                    os.remove(f_letters.name)
-                except:
-                    pass
-                try:
-                    os.remove(f_word.name)
-                except:
-                    pass
\ No newline at end of file
+            play_bytes(cache.get_or_synthesize(word, lang=self.lang, slow=self.slow_word, engine=self.engine))
+
+        except Exception as e:
+            print(f"❌ TTS Error: {e}")
@@ -1,37 +1,48 @@
 import streamlit as st
-import cv2
-import google.generativeai as genai
 import os
-import base64
-import requests
+import threading
 import time
-import random
-from dotenv import load_dotenv
-from PIL import Image, ImageDraw, ImageFont
-import numpy as np
-from gtts import gTTS
-import tempfile
-from playsound import playsound
-import speech_recognition as sr
-import difflib
-
-# Import our custom modules
-from tts_module import DyslexiaTTS
-from speech_module import recognize_speech_unified
-
-# Load environment variables
-load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY", "")
+
+# Import our custom modules (light ones only; cv2, numpy and speech_recognition
+# are pulled in on first use by the handlers that need them)
+from audio_backend import play_bytes
+from audio_delivery import deliver_clip, plays_in_browser
+from audio_cache import get_tts_cache
+from clip_bank import load_clip_bank, token_for_char
+from audio_pipeline import play_pipelined
+from spelled_track import build_spelled_track
+from highlight_widget import render_spell_widget
+from feedback_store import fetch_feedback, get_feedback_store
+from gemini_gateway import get_gateway
+
+# ========================================
+# ♻️ PROCESS-WIDE RESOURCES (built once, reused by every rerun and session)
+# ========================================
+@st.cache_resource
+def load_api_key():
+    """Read .env once per process instead of on every click."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("GOOGLE_API_KEY", "")
+
+@st.cache_resource
+def warm_audio_engine():
+    """Pick the TTS engine once per process."""
+    from tts_engines import get_engine
+    return get_engine()
+
+def clip_banks_ready():
+    """True if both letter clip banks exist (checked each run; loads are mtime-cached)."""
+    # Letter clips are pre-rendered by `python clip_bank.py`; a bank built later is picked up
+    return load_clip_bank('en', True) is not None and load_clip_bank('en', False) is not None
+
+api_key = load_api_key()
 if not api_key:
     st.warning("⚠️ GOOGLE_API_KEY not found. Object detection and AI feedback are disabled.")
-    model = None
-else:
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("models/gemini-2.5-flash")
-    except Exception as _e:
-        model = None
-        st.warning("⚠️ Gemini model could not be initialized. Some features are disabled.")
+
+warm_audio_engine()
+if not clip_banks_ready():
+    st.info("ℹ️ Letter clip bank not built yet. Run `python clip_bank.py` for instant offline spelling.")
 
 # ========================================
 # 🎨 SYNCHRONIZED LETTER HIGHLIGHTING + TTS
@@ -44,10 +55,9 @@ def spell_word_with_highlighting(word, slow_letters=True, slow_word=False):
     """
     placeholder = st.empty()
     word_upper = word.upper()
-    
-    # Step 1: Spell each letter with synchronized audio + visual
-    for i, letter in enumerate(word_upper):
-        
+    letter_bank = load_clip_bank('en', slow_letters)
+
+    def render_letter(i):
         html_parts = []
         for j, char in enumerate(word_upper):
             if j == i:
@@ -70,110 +80,115 @@ def spell_word_with_highlighting(word, slow_letters=True, slow_word=False):
         </div>
         """
         placeholder.markdown(full_html, unsafe_allow_html=True)
-        
-        # Play audio (SILENT FOR SPACES)
+
+    def render_final():
+        final_html = f"""
+        <div style='text-align:center; margin:30px 0;'>
+            <div style='font-size:72px; font-weight:bold; color:#2E86AB; 
+                        text-shadow:2px 2px 6px rgba(0,0,0,0.3); letter-spacing:8px;
+                        font-family: \"Comic Sans MS\", \"Comfortaa\", cursive;'>
+                {word_upper}
+            </div>
+            <div style='font-size:24px; color:#666; margin-top:15px; font-family: \"Comic Sans MS\", \"Comfortaa\", cursive;'>
+                Now say it together! 👇
+            </div>
+        </div>
+        """
+        placeholder.markdown(final_html, unsafe_allow_html=True)
+
+    # Preferred: one track for the whole spelling, highlights driven by its timing map
+    try:
+        track = build_spelled_track(word, 'en', slow_letters, slow_word)
+    except Exception as e:
+        track = None
+        print(f"⚠️ Single-track spelling unavailable ({e}); playing clip by clip")
+
+    if track is not None and plays_in_browser():
+        # The browser plays the track and animates the letters from the timing map
+        placeholder.empty()
+        render_spell_widget(track)
+        return
+
+    if track is not None:
+        # Server speakers: play the track in the background, highlight from its timing map here
+        player = threading.Thread(target=play_bytes, args=(track.audio,), daemon=True)
+        start = time.perf_counter()
+        player.start()
+        for timing in track.timings:
+            time.sleep(max(0.0, timing["start_ms"] / 1000 - (time.perf_counter() - start)))
+            render_letter(timing["index"])
+        time.sleep(max(0.0, track.word_start_ms / 1000 - (time.perf_counter() - start)))
+        render_final()
+        player.join()
+        return
+
+    if plays_in_browser():
+        # Each clip replaces the last in one player slot; waiting its duration keeps highlights in step
+        audio_slot = st.empty()
+        play_clip = lambda clip: deliver_clip(clip, wait=True, container=audio_slot)
+    else:
+        play_clip = play_bytes
+
+    # Fallback: letters first, then the whole word; clips are synthesized ahead of playback
+    items = [("letter", letter) for letter in word_upper] + [("word", word)]
+
+    def fetch(item):
+        kind, text = item
+        if kind == "word":
+            return get_tts_cache().get_or_synthesize(text, lang='en', slow=slow_word)
+        token = token_for_char(text)
+        if text == ' ' or token is None:
+            return None  # SILENT FOR SPACES
+        if letter_bank is not None:
+            return letter_bank.data(token)
+        return get_tts_cache().get_or_synthesize(token, lang='en', slow=slow_letters)
+
+    def on_start(index, item):
+        if item[0] == "word":
+            # Step 2: Show full word (Standard Blue) as it is spoken
+            time.sleep(0.3)
+            render_final()
+        else:
+            # Step 1: Highlight the letter whose clip is about to play
+            render_letter(index)
+
+    def play(item, clip):
         try:
-            if letter == ' ':
+            if clip is None:
                 # Do not play audio, just pause
                 time.sleep(0.3)
             else:
-                letter_tts = gTTS(text=letter, lang='en', slow=slow_letters)
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
-                    letter_tts.save(f.name)
-                    playsound(f.name)
-                    os.remove(f.name)
+                play_clip(clip)
         except Exception as e:
             st.error(f"Audio error: {e}")
-        
-        time.sleep(0.2)
-    
-    # Step 2: Show full word (Standard Blue) and speak it
-    time.sleep(0.3)
-    
-    final_html = f"""
-    <div style='text-align:center; margin:30px 0;'>
-        <div style='font-size:72px; font-weight:bold; color:#2E86AB; 
-                    text-shadow:2px 2px 6px rgba(0,0,0,0.3); letter-spacing:8px;
-                    font-family: \"Comic Sans MS\", \"Comfortaa\", cursive;'>
-            {word_upper}
-        </div>
-        <div style='font-size:24px; color:#666; margin-top:15px; font-family: \"Comic Sans MS\", \"Comfortaa\", cursive;'>
-            Now say it together! 👇
-        </div>
-    </div>
-    """
-    placeholder.markdown(final_html, unsafe_allow_html=True)
-    
-    try:
-        word_tts = gTTS(text=word, lang='en', slow=slow_word)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
-            word_tts.save(f.name)
-            playsound(f.name)
-            os.remove(f.name)
-    except Exception as e:
-        st.error(f"Audio error: {e}")
+        if item[0] == "letter":
+            time.sleep(0.2)
+
+    play_pipelined(items, fetch, play, on_start=on_start)
 
 # ========================================
 # OBJECT DETECTION FUNCTIONS
 # ========================================
-def get_object_detection_gemini(frame):
-    """Detects objects in image using Gemini API."""
-    if not api_key: return None
-    
+def get_object_detection(image_bytes, session_id=None):
+    """Detects objects: detection cache, then the local classifier, then Gemini."""
     try:
-        # Resize if huge
-        height, width = frame.shape[:2]
-        if width > 800:
-            scale = 800 / width
-            frame = cv2.resize(frame, (800, int(height * scale)))
-        
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
-        encoded_image = base64.b64encode(buffer).decode('utf-8')
-        
-        payload = {
-            "contents": [{
-                "parts": [
-                    {"text": "Look at this image carefully. Identify the main object that a person is showing or holding. Return only the single most prominent object name in English (e.g. 'Apple', 'Book'). Be specific and concise."},
-                    {"inline_data": {"mime_type": "image/jpeg", "data": encoded_image}}
-                ]
-            }]
-        }
-        
-        api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
-        headers = {'Content-Type': 'application/json'}
-        
-        response = requests.post(api_url, headers=headers, json=payload, timeout=20)
-        if response.status_code == 200:
-            candidates = response.json().get('candidates', [])
-            if candidates and 'content' in candidates[0]:
-                text = candidates[0]['content']['parts'][0]['text']
-                
-                # Cleanup text
-                detected_text = text.strip()
-                prefixes = ["The object is", "I can see", "This is", "Object:"]
-                for p in prefixes:
-                    if detected_text.lower().startswith(p.lower()):
-                        detected_text = detected_text[len(p):].strip()
-                return detected_text.split('.')[0].strip()
-            
+        from tiered_detection import detect_image  # Loads cv2 on the first detection only
+        return detect_image(image_bytes, api_key, session_id=session_id)
     except Exception as e:
         st.error(f"Detection Error: {e}")
     return None
 
-def get_pronunciation_feedback(word):
+def get_pronunciation_feedback(word, session_id=None):
     """Gets letter-by-letter pronunciation feedback from Gemini."""
     if not word or not api_key: return "Feedback unavailable."
     
     try:
-        payload = {
-            "contents": [{
-                "parts": [{"text": f"Explain how to pronounce '{word}' letter by letter for a dyslexic student. Simple English. No complex phonetics."}]
-            }]
-        }
-        api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
-        response = requests.post(api_url, headers={'Content-Type': 'application/json'}, json=payload)
-        return response.json()['candidates'][0]['content']['parts'][0]['text']
-    except:
+        # Stored answers come back without a Gemini call, across restarts too
+        text = get_feedback_store().get_or_fetch(
+            word, lambda w: fetch_feedback(w, api_key, session_id=session_id)
+        )
+        return text or "Could not get feedback."
+    except Exception:
         return "Could not get feedback."
 
 # ========================================
@@ -219,22 +234,39 @@ with col1:
 
     if img_file_buffer is not None:
         bytes_data = img_file_buffer.getvalue()
-        cv2_img = cv2.imdecode(np.frombuffer(bytes_data, np.uint8), cv2.IMREAD_COLOR)
-        st.session_state.last_frame = cv2_img
+        st.session_state.last_image = bytes_data
         
         if st.button("🔍 Detect Objects", key="detect_objects"):
             st.write("🔄 Processing...")
-            with st.spinner("Analyzing image with Gemini AI..."):
-                detected = get_object_detection_gemini(st.session_state.last_frame)
+            with st.spinner("Analyzing image..."):
+                result = get_object_detection(st.session_state.last_image,
+                                              session_id=st.session_state.session_id)
             
-            if detected:
+            if result and result.label:
+                detected = result.label
                 st.session_state.current_word = detected
                 st.session_state.detected_text = detected
+                st.session_state.detection_source = f"{result.tier}, {result.elapsed_ms:.0f} ms"
                 st.success(f"🎯 Detected: **{detected}**")
                 st.rerun() 
             else:
                 st.error("⚠️ No objects detected.")
 
+        if st.session_state.get("detection_source"):
+            st.caption(f"⚡ Last detection answered by {st.session_state.detection_source}")
+
+        from detection_cache import DETECTION_CACHE
+        cache_stats = DETECTION_CACHE.stats()
+        if cache_stats["hits"] + cache_stats["misses"]:
+            st.caption(f"♻️ Detection cache hit rate: {cache_stats['hit_rate']:.0%} "
+                       f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']})")
+
+        gateway_stats = get_gateway().metrics()
+        if gateway_stats["submitted"]:
+            st.caption(f"🚦 Gemini queue: {gateway_stats['queue_depth']} waiting, "
+                       f"avg wait {gateway_stats['wait_avg_s']:.1f}s, "
+                       f"{gateway_stats['coalesced']} duplicate requests shared")
+
 # --- COLUMN 2: MANUAL INPUT ---
 with col2:
     st.header("📝 Manual Input")
@@ -302,16 +334,11 @@ if st.session_state.get('current_word'):
             if st.session_state.current_word:
                 with st.spinner("🔊 Speaking..."):
                     try:
-                        tts = gTTS(
-                            text=st.session_state.current_word,
+                        deliver_clip(get_tts_cache().get_or_synthesize(
+                            st.session_state.current_word,
                             lang='en',
                             slow=slow_word
-                        )
-                        
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
-                            tts.save(f.name)
-                            playsound(f.name)
-                            os.remove(f.name)
+                        ))
                         
                         st.success("🔢 Word read!")
                     except Exception as e:
@@ -320,7 +347,8 @@ if st.session_state.get('current_word'):
     # Pronunciation feedback
     if st.button("💡 Get Pronunciation Help", key="pronunciation_help"):
         with st.spinner("Getting pronunciation help..."):
-            feedback = get_pronunciation_feedback(st.session_state.current_word)
+            feedback = get_pronunciation_feedback(st.session_state.current_word,
+                                                  session_id=st.session_state.session_id)
         
         st.subheader("💡 Pronunciation Help")
         st.markdown(feedback)
@@ -351,10 +379,13 @@ if st.session_state.get('current_word'):
         st.subheader("🔤 Spelling")
         st.caption("Say: C... A... T...")
         if st.button("🎤 Practice Spelling", key="btn_spell_practice"):
+            # speech_recognition and the scorers load on the first practice click only
+            from speech_module import recognize_speech_unified
             feedback = recognize_speech_unified(
                 st.session_state.current_word, 
                 mode="spelling", 
-                slow_speed=slow_word
+                slow_speed=slow_word,
+                session_id=st.session_state.session_id
             )
             if feedback:
                 # Calculate Score
@@ -367,10 +398,12 @@ if st.session_state.get('current_word'):
         st.subheader("🗣️ Pronunciation")
         st.caption(f"Say: {st.session_state.current_word}")
         if st.button("🎤 Practice Speaking", key="btn_pronounce_practice"):
+            from speech_module import recognize_speech_unified
             feedback = recognize_speech_unified(
                 st.session_state.current_word, 
                 mode="pronunciation", 
-                slow_speed=slow_word
+                slow_speed=slow_word,
+                session_id=st.session_state.session_id
             )
 
 # Footer
@@ -0,0 +1,147 @@
+import collections
+import time
+
+import numpy as np
+
+# ========================================
+# 🔇 VOICE ACTIVITY DETECTION / ENDPOINTING
+# ========================================
+FRAME_MS = 20
+# Trailing silence that ends an attempt. Children pause between spelled
+# letters, so spelling tolerates a much longer gap than a single word.
+HANGOVER_MS = {"spelling": 1200, "pronunciation": 450}
+
+
+class EnergyVAD:
+    def __init__(self, sample_rate, sample_width=2, energy_threshold=300.0, hangover_ms=450,
+                 frame_ms=FRAME_MS, min_speech_ms=120, zcr_max=0.25):
+        """
+        Energy + zero-crossing voice activity detector over 16-bit PCM.
+        :param sample_rate: Rate of the PCM being fed
+        :param energy_threshold: RMS (int16 scale) above which a frame may be speech;
+                                 sr.Recognizer.energy_threshold uses the same scale
+        :param hangover_ms: Trailing silence that ends the utterance
+        :param min_speech_ms: Speech needed before an endpoint can fire (ignores clicks)
+        :param zcr_max: Zero-crossing rate above which quiet frames are treated as
+                        hiss rather than voice
+        """
+        if sample_width != 2:
+            raise ValueError("EnergyVAD expects 16-bit PCM")
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.energy_threshold = energy_threshold
+        self.hangover_ms = hangover_ms
+        self.min_speech_ms = min_speech_ms
+        self.zcr_max = zcr_max
+        self.reset()
+
+    @classmethod
+    def for_mode(cls, mode, sample_rate, **kwargs):
+        kwargs.setdefault("hangover_ms", HANGOVER_MS.get(mode, HANGOVER_MS["pronunciation"]))
+        return cls(sample_rate, **kwargs)
+
+    def reset(self):
+        self._carry = np.zeros(0, dtype=np.int16)
+        self.speech_ms = 0
+        self.silence_ms = 0
+        self.noise_rms = None  # Running mean RMS of frames judged silent
+        self._noise_frames = 0
+
+    @property
+    def triggered(self):
+        """True once enough speech has been heard to start endpointing."""
+        return self.speech_ms >= self.min_speech_ms
+
+    def _classify(self, samples):
+        frames = samples.reshape(-1, self.frame_len).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_len - 1)
+        loud = rms > self.energy_threshold
+        # Quiet-ish frames that cross zero constantly are fricative noise/hiss;
+        # clearly loud frames count as speech whatever their ZCR.
+        return loud & ((zcr < self.zcr_max) | (rms > 3 * self.energy_threshold)), rms
+
+    def classify(self, samples):
+        """Vectorized per-frame speech decision for whole frames of int16 samples."""
+        return self._classify(samples)[0]
+
+    def process(self, chunk):
+        """
+        Feed raw PCM bytes. Returns True when the utterance has ended
+        (speech was heard and has been followed by `hangover_ms` of silence).
+        """
+        samples = np.concatenate([self._carry, np.frombuffer(chunk, dtype=np.int16)])
+        whole = len(samples) - len(samples) % self.frame_len
+        self._carry = samples[whole:]
+        if whole == 0:
+            return False
+
+        speech, rms = self._classify(samples[:whole])
+        # Only frames under the threshold: rejected speech (loud hiss) would inflate the floor
+        quiet = rms[~speech & (rms < self.energy_threshold)]
+        if len(quiet):
+            total = self._noise_frames + len(quiet)
+            previous = self.noise_rms or 0.0
+            self.noise_rms = (previous * self._noise_frames + float(quiet.sum())) / total
+            self._noise_frames = total
+
+        if speech.any():
+            self.speech_ms += int(np.count_nonzero(speech)) * self.frame_ms
+            trailing = len(speech) - 1 - int(np.flatnonzero(speech)[-1])
+            self.silence_ms = trailing * self.frame_ms
+        else:
+            self.silence_ms += len(speech) * self.frame_ms
+        return self.triggered and self.silence_ms >= self.hangover_ms
+
+
+def listen_with_vad(source, vad, timeout=8.0, max_seconds=15.0, preroll_ms=300):
+    """
+    Drop-in for sr.Recognizer.listen that stops as soon as the speaker does.
+    :param source: Open sr.Microphone
+    :param vad: EnergyVAD configured for the source's sample rate
+    :param timeout: Seconds to wait for speech to start
+    :param max_seconds: Hard cap on the utterance length
+    :param preroll_ms: Audio kept from before speech started so onsets are not clipped
+    :return: sr.AudioData
+    """
+    import speech_recognition as sr
+
+    chunk_frames = source.CHUNK
+    chunk_ms = 1000 * chunk_frames / source.SAMPLE_RATE
+    preroll = collections.deque(maxlen=max(1, int(preroll_ms / chunk_ms)))
+    captured = []
+    vad.reset()
+
+    started = time.monotonic()
+    speech_started = None
+    while True:
+        chunk = source.stream.read(chunk_frames)
+        if not chunk:
+            break
+        ended = vad.process(chunk)
+        now = time.monotonic()
+
+        if speech_started is None:
+            if vad.speech_ms > 0:
+                speech_started = now
+                captured.extend(preroll)
+                captured.append(chunk)
+            else:
+                preroll.append(chunk)
+                if now - started > timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            continue
+
+        captured.append(chunk)
+        if not vad.triggered and vad.silence_ms >= vad.hangover_ms:
+            # Just a click or a cough; go back to waiting for real speech
+            speech_started = None
+            captured = []
+            vad.reset()
+            continue
+        if ended or now - speech_started >= max_seconds:
+            break
+
+    return sr.AudioData(b"".join(captured), source.SAMPLE_RATE, source.SAMPLE_WIDTH)